@@ -1,20 +1,45 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-import secrets
 
 db = SQLAlchemy()
-migrate = Migrate()
 
-def create_app():
+def create_app(config_name=None):
+    """Build the app. No database work happens here: the schema and default data
+    come from `flask init-db` (or `flask db upgrade`)."""
     app = Flask(__name__)
-    
-    app.config['SECRET_KEY'] = secrets.token_hex(16)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///bookings.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # optional but recommended
+
+    from .config import load_config
+    load_config(app, config_name)
+
+    # Trust X-Forwarded-* from the load balancer(s) so url_for and redirects use the public host/scheme
+    if app.config['PROXY_COUNT']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        count = app.config['PROXY_COUNT']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=count, x_proto=count, x_host=count, x_port=count)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+
+    from .database import init_engine
+    with app.app_context():
+        init_engine(app, db.engine)
+
+    from .cache import cache
+    cache.init_app(app)
+
+    from .pricing import pricing
+    pricing.init_app(app)
+
+    from .passwords import passwords
+    passwords.init_app(app)
+
+    from .events import broker
+    broker.init_app(app)
+
+    from .assets import manifest
+    manifest.init_app(app)
+
+    from .images import images
+    images.init_app(app)
     
     from .routes import main
     from .adminAuth import admin_Auth
@@ -22,6 +47,11 @@ def create_app():
     from .statistics import statistics
     from .userAuth import userAuth
     from .userRoutes import userRoutes
+    from .exports import exports
+    from .memberImport import memberImport
+    from .workouts import workouts
+    from .events import events
+    from .assets import assets
 
     app.register_blueprint(main)
     app.register_blueprint(admin_Auth)
@@ -29,28 +59,17 @@ def create_app():
     app.register_blueprint(statistics)
     app.register_blueprint(userAuth)
     app.register_blueprint(userRoutes)
-    
-    with app.app_context():
-        from .models import Admin, Member, MembershipLog, GymPricing, Workout
-        db.create_all()
-        
-        if not Admin.query.filter_by(username='admin').first():
-            default_admin = Admin(username='admin')
-            default_admin.set_password('admin123')
-            db.session.add(default_admin)
-            db.session.commit()
-            
-        if GymPricing.query.count() == 0:
-            default_prices = [
-                # Under suspection cause it shits
-                GymPricing(member_type='Student', plan_type='Daily', price=40),
-                GymPricing(member_type='Faculty', plan_type='Daily', price=40),
-                GymPricing(member_type='Outsider', plan_type='Daily', price=60),
-                GymPricing(member_type='Student', plan_type='Monthly', price=500),
-                GymPricing(member_type='Faculty', plan_type='Monthly', price=500),
-                GymPricing(member_type='Outsider', plan_type='Monthly', price=800)
-            ]
-            db.session.add_all(default_prices)
-            db.session.commit()
-        
+    app.register_blueprint(exports)
+    app.register_blueprint(memberImport)
+    app.register_blueprint(workouts)
+    app.register_blueprint(events)
+    app.register_blueprint(assets)
+
+    from .commands import register_commands
+    register_commands(app)
+
+    from .scheduler import scheduler, register_default_jobs
+    scheduler.init_app(app)
+    register_default_jobs(scheduler)
+
     return app
@@ -1,54 +1,166 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
-from . import db
-from .models import Member, MembershipLog, GymPricing
+from . import db, rollups
+from .models import Member, MembershipLog
+from .pagination import encode_cursor, decode_cursor, coerce_cursor_value, keyset_filter
+from .cache import cache, invalidate_member_data, invalidate_user_data
+from .adminAuth import admin_required
+from .events import publish, publish_member_change, publish_log, member_snapshot
+from .versioning import conditional_on_data, versioned_cache_key
 from datetime import datetime
 from functools import lru_cache
 import pytz
 import calendar
-import time  # ✅ for time.time()
-from sqlalchemy import and_, func  # ✅ for and_ and func
+from sqlalchemy import and_, func, exists, select, insert, update, literal, cast  # ✅ for and_ and func
 
 
 addMember = Blueprint('addMember', __name__)
 
-# Cache (in-memory)
-_cache_data = None
-_cache_time = 0
+DASHBOARD_CACHE_KEY = 'admin:dashboard_summary'
+
+# Member table paging
+MEMBER_PAGE_SIZE = 10
+MEMBER_PAGE_MAX = 100
+MEMBER_SORT_COLUMNS = {
+    'member_id': Member.member_id,
+    'unique_code': Member.unique_code,
+    'first_name': Member.first_name,
+    'last_name': Member.last_name,
+    'start_date': Member.start_date,
+    'end_date': Member.end_date,
+    'date_registered': Member.date_registered,
+}
 
 # Automatically mark members as expired if their end_date has passed.
 def auto_update_expired_members():
+    """Expire overdue members and log it in one set-based transaction. Returns the count."""
     tz = pytz.timezone("Asia/Manila")
-    today = datetime.now(tz).date()
+    now = datetime.now(tz)
+    today = now.date()
 
-    expired_members = Member.query.filter(
-        and_(
-            Member.end_date < today,
-            Member.status != "Expired"
-        )
-    ).all()
+    # 🔥 Members manually set to Active are skipped (admin override), so with
+    # Expired excluded too, only overdue Inactive members are swept.
+    overdue = and_(
+        Member.end_date < today,
+        Member.status == "Inactive"
+    )
 
-    count = 0
-    for member in expired_members:
-        # 🔥 Skip members manually set to Active (admin override)
-        if member.status == "Active":
-            continue
+    # Cheap indexed check first so the usual "nothing to do" case never takes a write lock
+    if not db.session.query(exists().where(overdue)).scalar():
+        return 0
 
-        member.status = "Expired"
-        count += 1
+    try:
+        rollups.record_bulk_status_change(overdue, "Expired")
+
+        # Log rows first, while the overdue members still match the filter
+        remarks = literal("Automatically marked as expired (End date: ") + cast(Member.end_date, db.String) + literal(").")
+        db.session.execute(
+            insert(MembershipLog.__table__).from_select(
+                ['member_id', 'action_type', 'action_date', 'remarks'],
+                select(
+                    Member.member_id,
+                    literal('Status Update'),
+                    literal(now, db.DateTime),
+                    remarks
+                ).where(overdue)
+            )
+        )
 
-        log = MembershipLog(
-            member_id=member.member_id,
-            action_type='Status Update',
-            remarks=f"Automatically marked as expired (End date: {member.end_date})."
+        result = db.session.execute(
+            update(Member)
+            .where(overdue)
+            .values(status="Expired")
+            .execution_options(synchronize_session=False)
         )
-        db.session.add(log)
+        count = result.rowcount
 
-    if count > 0:
+        publish('refresh', {"reason": "expired", "count": count})
         db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
 
+    invalidate_member_data()
+    invalidate_user_data()
     return count
 
 
+def serialize_member_row(m):
+    """Fields the members table needs for one row."""
+    return {
+        "member_id": m.member_id,
+        "unique_code": m.unique_code,
+        "first_name": m.first_name,
+        "last_name": m.last_name,
+        "member_type": m.member_type,
+        "gym_plan": m.gym_plan,
+        "status": m.status,
+        "email": m.email,
+        "contact_number": m.contact_number,
+        "start_date": m.start_date.strftime("%Y-%m-%d"),
+        "end_date": m.end_date.strftime("%Y-%m-%d")
+    }
+
+
+# Filter, sort and keyset-paginate members in SQL.
+def query_members_page(args):
+    """Return (members, next_cursor) for one page of the members table.
+
+    Accepted args: id, type, plan, status, sort (prefix with '-' for descending),
+    cursor and limit. Raises ValueError on bad input.
+    """
+    sort = args.get('sort') or 'member_id'
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in MEMBER_SORT_COLUMNS:
+        raise ValueError(f"Unknown sort key '{sort_key}'.")
+
+    try:
+        limit = int(args.get('limit') or MEMBER_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be a number.")
+    limit = max(1, min(limit, MEMBER_PAGE_MAX))
+
+    query = Member.query
+
+    # --- Filters ---
+    code = (args.get('id') or '').strip()
+    if code:
+        escaped = code.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = query.filter(Member.unique_code.ilike(f"%{escaped}%", escape='\\'))
+    if args.get('type'):
+        query = query.filter(Member.member_type == args.get('type'))
+    if args.get('plan'):
+        query = query.filter(Member.gym_plan == args.get('plan'))
+    if args.get('status'):
+        query = query.filter(Member.status == args.get('status'))
+
+    # --- Keyset: (sort column, member_id) is unique, so pages never overlap ---
+    columns = [MEMBER_SORT_COLUMNS[sort_key]]
+    if sort_key != 'member_id':
+        columns.append(Member.member_id)
+
+    cursor = args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns) + 1 or values[0] != sort:
+            raise ValueError("Cursor does not match the requested sort.")
+        try:
+            values = [coerce_cursor_value(col, v) for col, v in zip(columns, values[1:])]
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor.")
+        query = query.filter(keyset_filter(columns, values, descending))
+
+    order = [col.desc() if descending else col.asc() for col in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([sort] + [getattr(last, col.key) for col in columns])
+
+    return rows, next_cursor
+
 
 # Add Member
 @addMember.route('/admin/add-member', methods=['GET', 'POST'])
@@ -98,16 +210,11 @@ def add_member():
                 status='Active'
             )
 
-            # --- Fetch price based on type/plan ---
-            current_price = GymPricing.query.filter_by(
-                member_type=member_type,
-                plan_type=gym_plan
-            ).first()
-
-            new_member.price_paid = current_price.price if current_price else 0.0
+            # --- Price in effect today for this type/plan ---
+            new_member.set_registration_price()
 
             db.session.add(new_member)
-            db.session.commit()
+            db.session.flush()  # assigns member_id and date_registered
 
             # --- Log registration ---
             new_log = MembershipLog(
@@ -116,7 +223,11 @@ def add_member():
                 remarks=f"Member {first_name} {last_name} registered successfully."
             )
             db.session.add(new_log)
+            rollups.record_registration(new_member)
+            publish_member_change(None, member_snapshot(new_member))
+            publish_log(new_log, new_member)
             db.session.commit()
+            invalidate_member_data()
 
             # --- JSON Response (for AJAX/fetch) ---
             if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -146,12 +257,13 @@ def add_member():
     # 📋 GET Request - Render Members Page
     # ===========================
     if request.method == 'GET':
-        members = Member.query.all()
-        auto_update_expired_members()  # check and update expired members
-        return render_template('members.html', members=members)
+        # Expired members are swept by the maintenance scheduler, not on page load
+        members, next_cursor = query_members_page({})  # only the first page, tables.js fetches the rest
+        return render_template('members.html', members=members, next_cursor=next_cursor)
 
 # View specific member details (AJAX endpoint)
 @addMember.route('/admin/member/<int:member_id>', methods=['GET'])
+@conditional_on_data
 def view_member(member_id):
     member = Member.query.get_or_404(member_id)
     
@@ -181,8 +293,11 @@ def edit_member(member_id):
     try:
         data = request.get_json()   
 
-        # Track original type
+        # Track original type, plan and status
+        before = member_snapshot(member)
         old_type = member.member_type
+        old_plan = member.gym_plan
+        old_status = member.status
         new_type = data.get('member_type', member.member_type)
 
         # Update general info
@@ -209,6 +324,11 @@ def edit_member(member_id):
 
         member.status = data.get('status', member.status)
 
+        # Keep the daily rollups in step, in the same transaction
+        rollups.record_reclassification(member, old_type, old_plan)
+        rollups.record_status_change(member.member_type, member.gym_plan, old_status, member.status)
+        publish_member_change(before, member_snapshot(member))
+
         db.session.commit()
 
         # Log edit
@@ -218,7 +338,10 @@ def edit_member(member_id):
             remarks=f"Updated information for {member.first_name} {member.last_name}."
         )
         db.session.add(log)
+        publish_log(log, member)
         db.session.commit()
+        invalidate_member_data()
+        invalidate_user_data(member.member_id)
 
         flash(f"Member {member.first_name} {member.last_name} was updated successfully!", "success")
 
@@ -246,6 +369,8 @@ def delete_member(member_id):
     # Get member ID from database
     member = Member.query.get_or_404(member_id)
     try:
+        rollups.record_deletion(member)
+        publish_member_change(member_snapshot(member), None)
         db.session.delete(member)
         db.session.commit()
 
@@ -257,6 +382,8 @@ def delete_member(member_id):
         )
         db.session.add(log)
         db.session.commit()
+        invalidate_member_data()
+        invalidate_user_data(member_id)
 
         return jsonify({"success": True, "message": "Member deleted successfully!"})
 
@@ -265,13 +392,13 @@ def delete_member(member_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 @addMember.route('/admin/dashboard-summary', methods=['GET'])
+@conditional_on_data
 def dashboard_summary():
-    global _cache_data, _cache_time
-    now_time = time.time()
-    auto_update_expired_members()
-    # Serve from cache if < 10s old
-    if _cache_data and now_time - _cache_time < 10:
-        return jsonify(_cache_data)
+    # Serve from cache until it expires or a member write invalidates it
+    cache_key = versioned_cache_key(DASHBOARD_CACHE_KEY)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
 
     try:
         tz = pytz.timezone("Asia/Manila")
@@ -366,33 +493,30 @@ def dashboard_summary():
         }
 
         # Store to cache
-        _cache_data = result
-        _cache_time = now_time
+        cache.set(cache_key, result)
 
         return jsonify(result)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# Get all members as JSON (for members.js use)
+# Cache hit/miss counters for this worker
+@addMember.route('/admin/cache-stats', methods=['GET'])
+@admin_required
+def cache_stats():
+    return jsonify(cache.stats())
+
+# Get one page of members as JSON (for tables.js / members.js use)
 @addMember.route('/admin/members-json', methods=['GET'])
+@conditional_on_data
 def get_members_json():
-    members = Member.query.all()
+    try:
+        members, next_cursor = query_members_page(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     return jsonify({
-        "members": [
-            {
-                "member_id": m.member_id,
-                "unique_code": m.unique_code,
-                "first_name": m.first_name,
-                "last_name": m.last_name,
-                "member_type": m.member_type,
-                "gym_plan": m.gym_plan,
-                "status": m.status,
-                "email": m.email,
-                "contact_number": m.contact_number,
-                "start_date": m.start_date.strftime("%Y-%m-%d"),
-                "end_date": m.end_date.strftime("%Y-%m-%d")
-            }
-            for m in members
-        ]
-    })
\ No newline at end of file
+        "members": [serialize_member_row(m) for m in members],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    })
@@ -1,8 +1,22 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from functools import wraps
 from . import db    
 from .models import Admin
+from .passwords import HasherBusyError
 admin_Auth = Blueprint('adminAuth', __name__)
 
+# ========================================
+# ROUTE PROTECTION DECORATOR
+# ========================================
+def admin_required(f):
+    """Decorator for admin data endpoints - answers 401 JSON without an admin session."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'admin_id' not in session:
+            return jsonify({"success": False, "error": "Admin login required."}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
 @admin_Auth.route('/admin-login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
@@ -12,7 +26,15 @@ def admin_login():
         admin = Admin.query.filter_by(username=username).first()
         
         #Check if admin already exist and password is correct
-        if admin and admin.check_password(password):
+        try:
+            valid = admin is not None and admin.check_password(password)
+            if valid and admin.rehash_password_if_needed(password):
+                db.session.commit()
+        except HasherBusyError:
+            flash('Too many sign-ins right now. Please try again in a moment.', 'warning')
+            return render_template('adminAuth.html'), 503
+
+        if valid:
             session['admin_id'] = admin.id
             flash('Login successful!', 'success')
             return redirect(url_for('main.admin'))
@@ -0,0 +1,361 @@
+from flask import Blueprint, current_app, request, url_for, send_from_directory, abort
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+
+assets = Blueprint('assets', __name__)
+
+DIST_DIR = 'dist'                 # under the app's static folder; built by `flask build-assets`
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Bundles, in load order. Templates ask for the bundle name; without a build they get the sources.
+BUNDLES = {
+    'css/site.css': [
+        'css/base/base.css',
+        'css/base/scroll_modal.css',
+        'css/components/authentication.css',
+        'css/components/charts.css',
+        'css/components/features.css',
+        'css/components/table.css',
+        'css/layout/sidebar.css',
+        'css/layout/members.css',
+        'css/layout/background.css',
+        'css/layout/index.css',
+        'css/layout/statistics.css',
+        'css/layout/aboutUs.css',
+        'css/layout/user_navbar.css',
+        'css/theme.css',
+        'css/utilities.css',
+        'css/elements.css',
+        'css/buttons.css',
+    ],
+    'js/site.js': [
+        'js/admin_events.js',
+        'js/charts.js',
+        'js/tables.js',
+        'js/main.js',
+        'js/members.js',
+        'js/statistics.js',
+    ],
+}
+
+# Worth precompressing; images and fonts are already compressed
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+
+
+# ========================================
+# MINIFIERS (whitespace and comments only)
+# ========================================
+def _skip_string(source, i):
+    """Index just past the quoted string (or template literal) starting at source[i]."""
+    quote = source[i]
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+
+def minify_css(source):
+    out = []
+    i = 0
+    while i < len(source):
+        ch = source[i]
+        if ch in '"\'':
+            end = _skip_string(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = len(source) if end == -1 else end + 2
+            out.append(' ')
+        elif ch.isspace():
+            while i < len(source) and source[i].isspace():
+                i += 1
+            out.append(' ')
+        else:
+            out.append(ch)
+            i += 1
+
+    # Only outside strings: each token is either a whole string or a single character
+    text = []
+    for token in out:
+        if token == ' ':
+            # Whitespace is dropped next to punctuation; before ':' it can be a descendant combinator
+            if not text or text[-1] in '{};,>:' or text[-1] == ' ':
+                continue
+        elif token in '{};,>' and text and text[-1] == ' ':
+            text.pop()
+        if token == '}' and text and text[-1] == ';':
+            text.pop()
+        text.append(token)
+    return ''.join(text).strip()
+
+
+_JS_REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'in', 'of', 'delete', 'void', 'throw', 'new', 'else', 'do')
+_JS_TIGHT = set('{}()[];,:=<>+-*/%&|!?')
+
+
+def _regex_allowed(code):
+    """Whether a '/' after the emitted code starts a regular expression literal."""
+    code = code.rstrip()
+    if not code or code[-1] in _JS_REGEX_PREFIX:
+        return True
+    word = re.search(r'[A-Za-z_$]+$', code)
+    return bool(word) and word.group() in _JS_REGEX_KEYWORDS
+
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines.
+
+    Line breaks are kept (except after '{', ';' and ','), so automatic semicolon
+    insertion sees the same code. A space goes only where it sits between two
+    punctuation-free tokens, or between operators that could merge ('a + +b').
+    """
+    out = []
+    i = 0
+
+    def last():
+        return out[-1][-1] if out else '\n'
+
+    def emit(token):
+        if out and out[-1] == ' ':
+            before = out[-2][-1] if len(out) > 1 else '\n'
+            merges = before in '+-/' and token[0] == before  # keep 'a + +b', 'a - -b' and 'a / /re/' apart
+            if not merges and (before in _JS_TIGHT or token[0] in _JS_TIGHT):
+                out.pop()
+        out.append(token)
+
+    def emit_space(newline):
+        if newline:
+            if out and out[-1] == ' ':
+                out.pop()
+            if last() not in '\n{;,':
+                out.append('\n')
+        elif last() not in ' \n':
+            out.append(' ')
+
+    while i < len(source):
+        ch = source[i]
+        if ch in '"\'`':
+            end = _skip_string(source, i)
+            emit(source[i:end])
+            i = end
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = len(source) if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            comment = source[i:len(source) if end == -1 else end + 2]
+            i += len(comment)
+            emit_space('\n' in comment)
+        elif ch == '/' and _regex_allowed(''.join(out[-16:])):
+            start = i
+            i += 1
+            in_class = False
+            while i < len(source) and (source[i] != '/' or in_class):
+                if source[i] == '\\':
+                    i += 1
+                elif source[i] == '[':
+                    in_class = True
+                elif source[i] == ']':
+                    in_class = False
+                i += 1
+            emit(source[start:i + 1])
+            i += 1
+        elif ch.isspace():
+            start = i
+            while i < len(source) and source[i].isspace():
+                i += 1
+            emit_space('\n' in source[start:i])
+        else:
+            emit(ch)
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+# ========================================
+# BUILD
+# ========================================
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def _rebase_css_urls(css, source_dir, static_dir):
+    """Point relative url()s at the same files from the dist folder."""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+
+    def rebase(match):
+        quote, target = match.groups()
+        if re.match(r'^([a-z]+:|/|#)', target, re.I):  # data:, http:, absolute
+            return match.group(0)
+        path = os.path.normpath(os.path.join(source_dir, target))
+        return f"url({quote}{os.path.relpath(path, dist_dir).replace(os.sep, '/')}{quote})"
+
+    return _CSS_URL.sub(rebase, css)
+
+
+def _hashed_name(name, content):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def _write_asset(dist_dir, name, content, brotli):
+    """Write one fingerprinted file (plus .gz / .br copies). Returns its name relative to dist."""
+    hashed = _hashed_name(name, content)
+    path = os.path.join(dist_dir, hashed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    if name.endswith(COMPRESSIBLE):
+        with open(path + '.gz', 'wb') as f:
+            # mtime=0 keeps the output byte-identical between builds
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=9, mtime=0) as gz:
+                gz.write(content)
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(content, mode=brotli.MODE_TEXT))
+    return hashed
+
+
+def build_assets(static_dir):
+    """Bundle, minify and fingerprint everything under static_dir into static_dir/dist.
+
+    Every other static file is fingerprinted as-is, so templates can use asset_url() for
+    images too. Brotli copies are written when the `brotli` package is installed.
+    Returns the manifest (logical name -> file name under dist).
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+    manifest = {}
+
+    for bundle, sources in BUNDLES.items():
+        parts = []
+        for name in sources:
+            path = os.path.join(static_dir, name)
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            if bundle.endswith('.css'):
+                parts.append(minify_css(_rebase_css_urls(text, os.path.dirname(path), static_dir)))
+            else:
+                parts.append(minify_js(text))
+        joiner = '\n' if bundle.endswith('.css') else ';\n'  # a file without a trailing ';' can't run into the next
+        manifest[bundle] = _write_asset(dist_dir, bundle, joiner.join(parts).encode('utf-8'), brotli)
+
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist_dir]
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, static_dir).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                content = f.read()
+            if name.endswith('.css'):
+                content = minify_css(content.decode('utf-8')).encode('utf-8')
+            elif name.endswith('.js'):
+                content = minify_js(content.decode('utf-8')).encode('utf-8')
+            manifest[name] = _write_asset(dist_dir, name, content, brotli)
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+# ========================================
+# TEMPLATE HELPERS
+# ========================================
+class AssetManifest:
+    """Maps logical static names to built, fingerprinted files.
+
+    Without a build (or with ASSETS_USE_BUILD off) everything falls back to the
+    plain static files, so development needs no build step.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._manifest = None
+        self._mtime = None
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_USE_BUILD', not app.debug)  # debug edits show up without rebuilding
+        self.app = app
+        app.extensions['asset_manifest'] = self
+        app.jinja_env.globals.update(asset_url=asset_url, asset_urls=asset_urls)
+
+    @property
+    def path(self):
+        return os.path.join(self.app.static_folder, DIST_DIR, MANIFEST_NAME)
+
+    def lookup(self, name):
+        if not self.app.config['ASSETS_USE_BUILD']:
+            return None
+        if self._manifest is None or self.app.debug:
+            self._load()
+        return self._manifest.get(name)
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._manifest, self._mtime = {}, None
+            return
+        if mtime != self._mtime:
+            with open(self.path, encoding='utf-8') as f:
+                self._manifest = json.load(f)
+            self._mtime = mtime
+
+
+manifest = AssetManifest()
+
+
+def asset_url(filename):
+    """Like url_for('static', filename=...), but the fingerprinted build when there is one."""
+    hashed = manifest.lookup(filename)
+    if hashed is None:
+        return url_for('static', filename=filename)
+    return url_for('assets.built_asset', filename=hashed)
+
+
+def asset_urls(name):
+    """URLs to load for a bundle (one file once built, its sources otherwise) or a single file."""
+    if name in BUNDLES and manifest.lookup(name) is None:
+        return [url_for('static', filename=source) for source in BUNDLES[name]]
+    return [asset_url(name)]
+
+
+# ========================================
+# SERVING
+# ========================================
+@assets.route('/assets/<path:filename>')
+def built_asset(filename):
+    """Serve a fingerprinted file, precompressed when the browser accepts it. Cached for a year."""
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR)
+    if filename == MANIFEST_NAME or filename.endswith(('.gz', '.br')):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    served, encoding = filename, None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in request.accept_encodings and os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+            served, encoding = filename + suffix, candidate
+            break
+
+    response = send_from_directory(dist_dir, served, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    # The name changes with the content, so browsers never need to revalidate
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
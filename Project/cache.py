@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# ========================================
+# BACKENDS
+# ========================================
+class MemoryCache:
+    """Thread-safe LRU cache with per-entry TTL. Lives inside one worker process."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache:
+    """Cache stored in a small SQLite file, shared by every worker on the machine.
+
+    Values are stored as JSON, so only JSON-serializable data can be cached.
+    """
+
+    def __init__(self, path, max_entries=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across threads or forked workers, so keep one per thread per process
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+            # Cheap size cap: drop expired rows, then the soonest-to-expire ones
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                " SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete_prefix(self, prefix):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + '\uffff'))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+# ========================================
+# CACHE FACADE
+# ========================================
+class Cache:
+    """App-wide cache, configured like the other extensions with init_app().
+
+    CACHE_BACKEND picks 'memory' (per process, default) or 'sqlite' (shared by
+    all workers on the host). Keys are namespaced per endpoint, e.g.
+    'admin:dashboard_summary', so writes can drop a whole namespace at once.
+    """
+
+    def __init__(self):
+        self.backend = MemoryCache()
+        self.default_ttl = 10
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'memory')
+        app.config.setdefault('CACHE_DEFAULT_TTL', 10)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('CACHE_SQLITE_PATH', os.path.join(app.instance_path, 'cache.sqlite3'))
+
+        backend = app.config['CACHE_BACKEND']
+        max_entries = app.config['CACHE_MAX_ENTRIES']
+        if backend == 'memory':
+            self.backend = MemoryCache(max_entries)
+        elif backend == 'sqlite':
+            os.makedirs(os.path.dirname(app.config['CACHE_SQLITE_PATH']), exist_ok=True)
+            self.backend = SQLiteCache(app.config['CACHE_SQLITE_PATH'], max_entries)
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND '{backend}'.")
+
+        self.default_ttl = app.config['CACHE_DEFAULT_TTL']
+        app.extensions['cache'] = self
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(key, value, self.default_ttl if ttl is None else ttl)
+
+    def delete_prefix(self, prefix):
+        self.backend.delete_prefix(prefix)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters for this worker process."""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+
+cache = Cache()
+
+# Admin aggregates (dashboard, statistics) depend on members and their logs
+ADMIN_PREFIX = 'admin:'
+
+
+def invalidate_member_data():
+    """Drop cached admin aggregates after a member or membership log write."""
+    cache.delete_prefix(ADMIN_PREFIX)
+
+# Per-member pages (user dashboard) live under 'user:<member_id>:'
+USER_PREFIX = 'user:'
+
+
+def user_cache_key(member_id, name):
+    return f"{USER_PREFIX}{member_id}:{name}"
+
+
+def invalidate_user_data(member_id=None):
+    """Drop one member's cached pages after a workout or membership write (everyone's if member_id is None)."""
+    cache.delete_prefix(USER_PREFIX if member_id is None else f"{USER_PREFIX}{member_id}:")
@@ -0,0 +1,348 @@
+import click
+import pytz
+from datetime import datetime, timedelta
+from flask.cli import with_appcontext
+from sqlalchemy import select, func
+from . import db
+from .models import Member, DailyRollup
+from .dbfuncs import month_bucket
+
+
+# ========================================
+# HOT QUERIES (mirrors of the endpoint queries)
+# ========================================
+def hot_queries():
+    """Representative statements for the main endpoints, keyed by a readable name."""
+    from .userRoutes import dashboard_summary_query
+    from .statistics import membership_log_feed_query
+
+    tz = pytz.timezone('Asia/Manila')
+    now = datetime.now(tz).replace(tzinfo=None)
+    today = now.date()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    return {
+        "Expiry sweep (auto_update_expired_members)": (
+            select(Member.member_id)
+            .where(Member.end_date < today, Member.status == 'Inactive')
+        ),
+        "Members page (/admin/members-json)": (
+            select(Member)
+            .order_by(Member.member_id)
+            .limit(11)
+        ),
+        "Registrations per month and type (/admin/statistics-summary)": (
+            select(month_bucket(DailyRollup.local_date), DailyRollup.member_type, func.sum(DailyRollup.registrations))
+            .where(DailyRollup.local_date >= month_start.date())
+            .group_by(month_bucket(DailyRollup.local_date), DailyRollup.member_type)
+        ),
+        "User login (/user/login)": (
+            select(Member).where(Member.email == 'member@example.com').limit(1)
+        ),
+        "Membership log feed (/admin/membership-logs)": (
+            membership_log_feed_query(now - timedelta(days=7)).limit(51).statement
+        ),
+        "Membership log poll (/admin/membership-logs?since_id=)": (
+            membership_log_feed_query(now - timedelta(days=7), since_id=0).limit(51).statement
+        ),
+        "User dashboard summary (/user/dashboard)": dashboard_summary_query(1),
+    }
+
+
+# ========================================
+# CLI: flask explain-queries
+# ========================================
+@click.command('explain-queries')
+@with_appcontext
+def explain_queries_command():
+    """Print the database query plan of each hot endpoint query."""
+    engine = db.engine
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+
+    with engine.connect() as conn:
+        for name, stmt in hot_queries().items():
+            compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            click.secho(f"== {name}", bold=True)
+            click.echo(str(compiled).strip())
+            for row in conn.exec_driver_sql(prefix + str(compiled)):
+                # SQLite returns (id, parent, notused, detail); Postgres returns one text column
+                click.echo(f"   -> {row[-1]}")
+            click.echo()
+
+
+# ========================================
+# CLI: flask run-maintenance
+# ========================================
+@click.command('run-maintenance')
+@click.option('--once', is_flag=True, help='Run the jobs a single time and exit.')
+@with_appcontext
+def run_maintenance_command(once):
+    """Run the membership maintenance jobs (sidecar mode)."""
+    from .scheduler import scheduler
+
+    if once:
+        results = scheduler.run_once()
+        if results is None:
+            click.echo('Another process is running maintenance; skipped.')
+        else:
+            for name, result in results.items():
+                click.echo(f"{name}: {result}")
+        return
+
+    click.echo(f"Running maintenance every {scheduler.app.config['MAINTENANCE_INTERVAL']}s (Ctrl+C to stop)")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# ========================================
+# CLI: flask rebuild-rollups
+# ========================================
+@click.command('rebuild-rollups')
+@with_appcontext
+def rebuild_rollups_command():
+    """Recompute the daily registration/revenue rollup from scratch."""
+    from . import rollups
+    from .cache import invalidate_member_data
+
+    rows = rollups.rebuild()
+    invalidate_member_data()
+    click.echo(f"Rebuilt {rows} daily rollup rows.")
+
+
+# ========================================
+# CLI: flask repair-workout-stats
+# ========================================
+@click.command('repair-workout-stats')
+@with_appcontext
+def repair_workout_stats_command():
+    """Recompute every member's workout totals and streak from the workouts table."""
+    from .workouts import rebuild_workout_stats
+
+    members = rebuild_workout_stats()
+    click.echo(f"Repaired workout stats for {members} members.")
+
+
+# ========================================
+# CLI: flask benchmark-passwords
+# ========================================
+@click.command('benchmark-passwords')
+@click.option('--logins', default=200, show_default=True, help='Simultaneous logins to simulate.')
+@click.option('--method', default=None, help='Werkzeug hash method to try (default: PASSWORD_HASH_METHOD).')
+@with_appcontext
+def benchmark_passwords_command(logins, method):
+    """Simulate a login burst through the password hashing pool and report throughput."""
+    import os
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from werkzeug.security import generate_password_hash
+    from .passwords import passwords, HasherBusyError
+
+    method = method or passwords.method
+    password = 'correct horse battery staple'
+    stored = generate_password_hash(password, method)
+
+    start = time.perf_counter()
+    passwords.verify(stored, password)
+    single = time.perf_counter() - start
+
+    def login(_):
+        try:
+            return passwords.verify(stored, password)
+        except HasherBusyError:
+            return None
+
+    # One thread per simulated request, like a threaded server during a burst
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=logins) as clients:
+        results = list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    completed = sum(1 for r in results if r)
+    cores = min(passwords.workers, os.cpu_count() or 1)
+    click.echo(f"Method:          {stored.split('$', 1)[0]}")
+    click.echo(f"Hash workers:    {passwords.workers} (CPUs: {os.cpu_count()})")
+    click.echo(f"Single verify:   {single * 1000:.1f} ms")
+    click.echo(f"Burst:           {completed}/{logins} logins in {elapsed:.2f}s, {logins - completed} rejected as busy")
+    click.echo(f"Throughput:      {completed / elapsed:.1f} logins/s, {completed / elapsed / cores:.1f} logins/s per core")
+
+
+# ========================================
+# CLI: flask db / flask init-db / flask seed-defaults
+# ========================================
+def init_migrate(app):
+    """Attach Flask-Migrate to the app. Only the CLI needs it, so web workers never import Alembic."""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db)  # also replaces the lazy `db` group below with the real one
+    return app.extensions['migrate']
+
+
+class LazyMigrateGroup(click.Group):
+    """`flask db ...`, resolved to Flask-Migrate's command group on first use."""
+
+    def _real_group(self, ctx):
+        from flask.cli import ScriptInfo
+        from flask_migrate.cli import db as migrate_group
+        init_migrate(ctx.ensure_object(ScriptInfo).load_app())
+        return migrate_group
+
+    def list_commands(self, ctx):
+        return self._real_group(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._real_group(ctx).get_command(ctx, name)
+
+
+@click.group('db', cls=LazyMigrateGroup)
+@click.option('-d', '--directory', default=None, help='Migration script directory (default is "migrations")')
+@click.option('-x', '--x-arg', multiple=True, help='Additional arguments consumed by custom env.py scripts')
+@with_appcontext
+def db_command(directory, x_arg):
+    """Perform database migrations."""
+    from flask import g
+    g.directory = directory
+    g.x_arg = x_arg  # same as Flask-Migrate's own group; read by its subcommands
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create or upgrade the database schema and add the default admin and prices."""
+    from flask import current_app
+    from flask_migrate import upgrade
+
+    init_migrate(current_app)
+    upgrade()
+    click.echo("Database is up to date.")
+
+
+@click.command('seed-defaults')
+@with_appcontext
+def seed_defaults_command():
+    """Add the default admin and prices if they are missing."""
+    from .seed import seed_defaults
+
+    added = seed_defaults()
+    db.session.commit()
+    click.echo(f"Added {', '.join(added)}." if added else "Defaults already present.")
+
+
+# ========================================
+# CLI: flask benchmark-startup
+# ========================================
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from Project import create_app
+imported = time.perf_counter()
+create_app(sys.argv[1])
+built = time.perf_counter()
+json.dump({"import": imported - start, "create_app": built - imported}, sys.stdout)
+"""
+
+
+@click.command('benchmark-startup')
+@click.option('--runs', default=5, show_default=True, help='Cold starts to time (each in a fresh interpreter).')
+@with_appcontext
+def benchmark_startup_command(runs):
+    """Time a worker boot (import + create_app) and a repeated create_app, as test fixtures do."""
+    import json
+    import os
+    import statistics as stats
+    import subprocess
+    import sys
+    import time
+    from flask import current_app
+    from . import create_app
+
+    config_name = current_app.config['CONFIG_NAME']
+    root = os.path.dirname(current_app.root_path)
+
+    cold = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', STARTUP_PROBE, config_name], cwd=root,
+                             capture_output=True, text=True, check=True).stdout
+        cold.append(dict(json.loads(out), process=time.perf_counter() - start))
+
+    warm = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        create_app(config_name)
+        warm.append(time.perf_counter() - start)
+
+    def ms(values):
+        return f"{stats.median(values) * 1000:7.1f} ms"
+
+    click.echo(f"Config:               {config_name} (median of {runs})")
+    click.echo(f"Cold import:          {ms([r['import'] for r in cold])}")
+    click.echo(f"Cold create_app():    {ms([r['create_app'] for r in cold])}")
+    click.echo(f"Whole process:        {ms([r['process'] for r in cold])}")
+    click.echo(f"Warm create_app():    {ms(warm)}")
+
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Bundle, minify, fingerprint and precompress static files into static/dist."""
+    import os
+    from flask import current_app
+    from .assets import build_assets, BUNDLES, DIST_DIR
+
+    static_dir = current_app.static_folder
+    built = build_assets(static_dir)
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+
+    for name in BUNDLES:
+        path = os.path.join(dist_dir, built[name])
+        sources = sum(os.path.getsize(os.path.join(static_dir, source)) for source in BUNDLES[name])
+        gzipped = os.path.getsize(path + '.gz')
+        click.echo(f"{name:14} {len(BUNDLES[name]):2} files  {sources / 1024:6.1f} KiB -> "
+                   f"{os.path.getsize(path) / 1024:6.1f} KiB ({gzipped / 1024:.1f} KiB gzip)  {built[name]}")
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        click.echo("brotli is not installed: wrote gzip copies only.")
+    click.echo(f"{len(built)} assets written to {dist_dir}")
+
+
+@click.command('build-images')
+@with_appcontext
+def build_images_command():
+    """Write AVIF/WebP variants at several widths of the landing page images (needs Pillow)."""
+    import os
+    from flask import current_app
+    from .images import build_images
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise click.ClickException("Pillow is required: pip install Pillow")
+
+    static_dir = current_app.static_folder
+    for source, entry in build_images(static_dir).items():
+        original = os.path.getsize(os.path.join(static_dir, source))
+        width = min(min(files) for files in entry['variants'].values())
+        sizes = ", ".join(
+            f"{fmt} {os.path.getsize(os.path.join(static_dir, files[width])) / 1024:.1f} KiB"
+            for fmt, files in entry['variants'].items()
+        )
+        click.echo(f"{source:36} {original / 1024:7.1f} KiB -> at {width}px: {sizes}")
+    click.echo("Run `flask build-assets` afterwards to fingerprint the new files.")
+
+
+def register_commands(app):
+    """Attach the project's CLI commands to the app."""
+    app.cli.add_command(explain_queries_command)
+    app.cli.add_command(run_maintenance_command)
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(repair_workout_stats_command)
+    app.cli.add_command(benchmark_passwords_command)
+    app.cli.add_command(db_command)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_defaults_command)
+    app.cli.add_command(benchmark_startup_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(build_images_command)
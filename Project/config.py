@@ -0,0 +1,108 @@
+import os
+import secrets
+from .database import engine_options
+
+
+# ========================================
+# CONFIGURATION CLASSES
+# ========================================
+class Config:
+    """Settings shared by every mode. Anything here can be overridden (see load_config)."""
+    SECRET_KEY = None
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///bookings.db'  # relative paths live in instance/
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool (per worker process)
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_TIMEOUT = 30
+    DB_POOL_RECYCLE = 1800
+
+    # Postgres
+    DB_APPLICATION_NAME = 'gts-system'  # shows up in pg_stat_activity
+    DB_STATEMENT_TIMEOUT = 30000        # ms
+
+    # SQLite, applied to every connection
+    SQLITE_JOURNAL_MODE = 'WAL'
+    SQLITE_SYNCHRONOUS = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT = 5000           # ms to wait for a write lock before "database is locked"
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE = -64 * 1024       # negative = KiB, i.e. 64 MiB per connection
+
+    CACHE_BACKEND = 'memory'
+
+    # Number of reverse proxies / load balancers in front of the app (0 = none)
+    PROXY_COUNT = 0
+
+
+class DevelopmentConfig(Config):
+    """`flask run` / `python main.py` on one machine."""
+
+
+class ProductionConfig(Config):
+    """Several worker processes (and possibly several hosts) behind a load balancer."""
+    # One SQLite file per host, so every worker sees the same cache and invalidations
+    CACHE_BACKEND = 'sqlite'
+    SESSION_COOKIE_HTTPONLY = True
+    SESSION_COOKIE_SAMESITE = 'Lax'
+
+
+CONFIGS = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+}
+
+# Plain environment variables -> (config key, type)
+ENV_SETTINGS = {
+    'SECRET_KEY': ('SECRET_KEY', str),
+    'DATABASE_URL': ('SQLALCHEMY_DATABASE_URI', str),
+    'DB_POOL_SIZE': ('DB_POOL_SIZE', int),
+    'DB_MAX_OVERFLOW': ('DB_MAX_OVERFLOW', int),
+    'DB_POOL_TIMEOUT': ('DB_POOL_TIMEOUT', int),
+    'DB_POOL_RECYCLE': ('DB_POOL_RECYCLE', int),
+    'CACHE_BACKEND': ('CACHE_BACKEND', str),
+    'MAINTENANCE_ENABLED': ('MAINTENANCE_ENABLED', lambda v: v.lower() in ('1', 'true', 'yes', 'on')),
+    'PROXY_COUNT': ('PROXY_COUNT', int),
+    'SQLITE_JOURNAL_MODE': ('SQLITE_JOURNAL_MODE', str),
+    'SQLITE_SYNCHRONOUS': ('SQLITE_SYNCHRONOUS', str),
+    'SQLITE_BUSY_TIMEOUT': ('SQLITE_BUSY_TIMEOUT', int),
+}
+
+
+# ========================================
+# LOADING
+# ========================================
+def load_config(app, config_name=None):
+    """Fill app.config, later sources winning:
+
+    1. the class for GTS_CONFIG ('development' by default, or 'production')
+    2. instance/config.py, then the file named by GTS_SETTINGS (both optional)
+    3. the environment variables in ENV_SETTINGS, then any FLASK_<KEY> variable
+    """
+    config_name = config_name or os.environ.get('GTS_CONFIG', 'development')
+    if config_name not in CONFIGS:
+        raise ValueError(f"Unknown GTS_CONFIG '{config_name}', expected one of {', '.join(CONFIGS)}.")
+
+    app.config.from_object(CONFIGS[config_name])
+    app.config['CONFIG_NAME'] = config_name
+    # Explicit path: Flask(__name__) resolves relative config files against the package, not instance/
+    app.config.from_pyfile(os.path.join(app.instance_path, 'config.py'), silent=True)
+    app.config.from_envvar('GTS_SETTINGS', silent=True)
+
+    for env_name, (key, convert) in ENV_SETTINGS.items():
+        if os.environ.get(env_name):
+            app.config[key] = convert(os.environ[env_name])
+    app.config.from_prefixed_env()
+
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('postgres://'):
+        # Some hosts still hand out the old scheme, which SQLAlchemy no longer accepts
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://' + uri[len('postgres://'):]
+
+    if not app.config.get('SECRET_KEY'):
+        if config_name == 'production':
+            raise RuntimeError("SECRET_KEY must be set in production; every worker needs the same key.")
+        # Development only: sessions reset on every restart
+        app.config['SECRET_KEY'] = secrets.token_hex(16)
+
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
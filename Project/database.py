@@ -0,0 +1,66 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+# ========================================
+# ENGINE PROFILES
+# ========================================
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database (SQLite or Postgres)."""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    backend = url.get_backend_name()
+
+    if backend == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            return {}  # in-memory databases keep Flask-SQLAlchemy's single shared connection
+        return {
+            # sqlite3 connections are cheap: keep one per server thread, never wait on the pool
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'connect_args': {'check_same_thread': False},
+        }
+
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': True,  # survive server restarts and idle-connection reaping
+    }
+    if backend == 'postgresql':
+        options['connect_args'] = {
+            'application_name': config['DB_APPLICATION_NAME'],
+            'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}",
+        }
+    return options
+
+
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new SQLite connection."""
+    return [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",  # WAL: readers don't wait for writers
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",    # NORMAL is durable enough in WAL mode
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+        "PRAGMA temp_store=MEMORY",
+        # foreign_keys stays off: member deletes log against the removed member_id afterwards
+    ]
+
+
+def init_engine(app, engine):
+    """Apply the SQLite connection profile to an engine created by Flask-SQLAlchemy."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = sqlite_pragmas(app.config)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
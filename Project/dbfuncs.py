@@ -0,0 +1,44 @@
+from sqlalchemy import func, cast
+from . import db
+
+
+# ========================================
+# DIALECT-AWARE DATE BUCKETS
+# ========================================
+# DateTime columns hold naive Asia/Manila local time (the model defaults drop the
+# tzinfo on save), so bucketing the raw value already gives Manila-local buckets.
+
+def month_bucket(column):
+    """SQL expression for 'YYYY-MM' of a date/datetime column."""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return func.strftime('%Y-%m', column)
+    if dialect == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    return func.date_format(column, '%Y-%m')
+
+
+
+def day_bucket(column):
+    """SQL expression for the calendar date of a datetime column, typed as Date."""
+    if db.engine.dialect.name == 'sqlite':
+        return func.date(column, type_=db.Date)
+    return cast(column, db.Date)
+
+
+# ========================================
+# DIALECT-AWARE UPSERTS
+# ========================================
+def upsert_insert(table):
+    """INSERT supporting ON CONFLICT on SQLite and Postgres, or None on other databases.
+
+    The dialect module is imported on first use, so SQLite deployments never load Postgres support.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(table)
@@ -0,0 +1,259 @@
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from sqlalchemy import event, select, func, delete, text
+from sqlalchemy.orm import Session
+from . import db
+from .models import AdminEvent
+from .adminAuth import admin_required
+from datetime import datetime, date, timedelta
+import calendar
+import json
+import os
+import threading
+import time
+import pytz
+
+
+events = Blueprint('events', __name__)
+
+EVENTS_PG_LOCK_KEY = 0x67747365  # any constant; see publish()
+
+
+def _manila_now():
+    return datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+
+
+# ========================================
+# PUBLISHING (call before the write's commit)
+# ========================================
+def publish(event_type, data):
+    """Record a dashboard delta in the current transaction; streams send it once it commits."""
+    if 'admin_events_published' not in db.session.info and db.engine.dialect.name == 'postgresql':
+        # Hold a transaction-level lock so events commit in id order and streams never skip one
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": EVENTS_PG_LOCK_KEY})
+    db.session.add(AdminEvent(event_type=event_type, payload=json.dumps(data, default=str)))
+    db.session.info['admin_events_published'] = True
+
+
+def member_snapshot(member):
+    """What the admin dashboards count about one member (the before/after of a member event)."""
+    today = _manila_now().date()
+    # Months of dashboard_summary's six-month chart that the membership overlaps
+    months = []
+    for i in range(5, -1, -1):
+        year, month = divmod(today.year * 12 + today.month - 1 - i, 12)
+        first = date(year, month + 1, 1)
+        last = first.replace(day=calendar.monthrange(year, month + 1)[1])
+        if member.start_date <= last and member.end_date >= first:
+            months.append(first.strftime("%b"))
+
+    registered = member.date_registered or _manila_now()
+    return {
+        "member_id": member.member_id,
+        "member_type": member.member_type,
+        "gym_plan": member.gym_plan,
+        "status": member.status,
+        "price_paid": member.price_paid or 0.0,
+        "registered": registered.strftime("%Y-%m-%d"),
+        "months": months,
+    }
+
+
+def publish_member_change(before, after):
+    """A member was added (before=None), edited, or deleted (after=None). Pass member_snapshot()s."""
+    publish('member', {"before": before, "after": after, "today": _manila_now().strftime("%Y-%m-%d")})
+
+
+def publish_log(log, member):
+    """A new membership log entry, shaped like a /admin/membership-logs row."""
+    if log.log_id is None:
+        db.session.flush()
+    publish('log', {
+        "log_id": log.log_id,
+        "member_id": member.member_id,
+        "member_name": f"{member.first_name} {member.last_name}",
+        "action_type": log.action_type,
+        "action_date": log.action_date.strftime("%Y-%m-%d %H:%M:%S"),
+        "remarks": log.remarks or ""
+    })
+
+
+def prune_admin_events():
+    """Delete events older than EVENTS_RETENTION_HOURS. Returns the number removed."""
+    cutoff = _manila_now() - timedelta(hours=current_app.config['EVENTS_RETENTION_HOURS'])
+    result = db.session.execute(delete(AdminEvent).where(AdminEvent.created_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+# ========================================
+# EVENT BROKER
+# ========================================
+class EventBroker:
+    """Wakes this process's open event streams when new events commit.
+
+    Commits made in this process wake the streams straight away. Commits made by
+    other workers are noticed by one watcher thread per process, which reads the
+    newest event id every EVENTS_POLL_INTERVAL seconds, and only while a stream is open.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.latest_id = 0
+        self.streams = 0
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._watcher_pid = None
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_POLL_INTERVAL', 1.0)        # seconds between cross-process checks
+        app.config.setdefault('EVENTS_HEARTBEAT', 15)             # seconds between keep-alive comments
+        app.config.setdefault('EVENTS_STREAM_MAX_SECONDS', 300)   # close (and let the browser resume) after this
+        app.config.setdefault('EVENTS_MAX_STREAMS', 2)            # per process; each open stream holds a server thread
+        app.config.setdefault('EVENTS_RETENTION_HOURS', 24)
+        self.app = app
+        app.extensions['event_broker'] = self
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def notify(self, latest_id=None):
+        with self._cond:
+            if latest_id is not None:
+                self.latest_id = max(self.latest_id, latest_id)
+            self._generation += 1
+            self._cond.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until something was published after `generation` was read. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._generation != generation, timeout)
+
+    # ----------------------------------------
+    # Stream slots
+    # ----------------------------------------
+    def open_stream(self):
+        with self._cond:
+            if self.streams >= self.app.config['EVENTS_MAX_STREAMS']:
+                return False
+            self.streams += 1
+            self._ensure_watcher()
+            self._cond.notify_all()
+            return True
+
+    def close_stream(self):
+        with self._cond:
+            self.streams -= 1
+
+    # ----------------------------------------
+    # Cross-process watcher
+    # ----------------------------------------
+    def _ensure_watcher(self):
+        # Started lazily (and again after a fork) so every worker process has its own
+        if self._watcher_pid != os.getpid():
+            self._watcher_pid = os.getpid()
+            threading.Thread(target=self._watch, name='admin-events-watcher', daemon=True).start()
+
+    def _watch(self):
+        interval = self.app.config['EVENTS_POLL_INTERVAL']
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self.streams > 0)  # idle: no queries at all
+            try:
+                with self.app.app_context(), db.engine.connect() as conn:
+                    latest = conn.execute(select(func.max(AdminEvent.id))).scalar() or 0
+            except Exception as e:
+                self.app.logger.warning("Admin event watcher failed: %s", e)
+                latest = 0
+            if latest > self.latest_id:
+                self.notify(latest)
+            time.sleep(interval)
+
+
+broker = EventBroker()
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_streams_after_commit(session):
+    if session.info.pop('admin_events_published', False):
+        broker.notify()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_published_events(session, previous_transaction):
+    session.info.pop('admin_events_published', None)
+
+
+# ========================================
+# SSE ENDPOINT
+# ========================================
+def _read_events(after_id, limit=100):
+    with db.engine.connect() as conn:  # returned to the pool at once: no transaction held between reads
+        return conn.execute(
+            select(AdminEvent.id, AdminEvent.event_type, AdminEvent.payload)
+            .where(AdminEvent.id > after_id)
+            .order_by(AdminEvent.id)
+            .limit(limit)
+        ).all()
+
+
+def _sse(event_type, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event_type}\ndata: {data}\n\n"
+
+
+@events.route('/admin/events', methods=['GET'])
+@admin_required
+def admin_event_stream():
+    """Server-Sent Events with dashboard deltas: `member`, `log` and `refresh`.
+
+    Starts with a `ready` event. A reconnecting browser sends Last-Event-ID and gets
+    what it missed; if that was already pruned it gets a `refresh` instead.
+    """
+    resume = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    try:
+        last_id = int(resume) if resume else None
+    except ValueError:
+        last_id = None
+
+    if not broker.open_stream():
+        return jsonify({"success": False, "error": "Too many open event streams."}), 503
+
+    config = current_app.config
+    try:
+        with db.engine.connect() as conn:
+            oldest, latest = conn.execute(select(func.min(AdminEvent.id), func.max(AdminEvent.id))).one()
+    except Exception:
+        broker.close_stream()
+        raise
+
+    resumed = last_id is not None
+    # Resuming past pruned events (or from another database): the client must reload its snapshots
+    missed = resumed and (last_id > (latest or 0) or (oldest is not None and oldest > last_id + 1))
+    if not resumed or missed:
+        last_id = latest or 0
+
+    def generate(last_id):
+        deadline = time.monotonic() + config['EVENTS_STREAM_MAX_SECONDS']
+        yield "retry: 2000\n"
+        yield _sse('ready', json.dumps({"last_id": last_id, "resumed": resumed}), last_id)
+        if missed:
+            yield _sse('refresh', json.dumps({"reason": "missed"}))
+
+        while time.monotonic() < deadline:
+            generation = broker.generation
+            rows = _read_events(last_id)
+            for event_id, event_type, payload in rows:
+                yield _sse(event_type, payload, event_id)
+                last_id = event_id
+            if rows:
+                continue
+            timeout = min(config['EVENTS_HEARTBEAT'], max(0.0, deadline - time.monotonic()))
+            if not broker.wait(generation, timeout):
+                yield ": keep-alive\n\n"
+
+    response = Response(stream_with_context(generate(last_id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    response.call_on_close(broker.close_stream)
+    return response
@@ -0,0 +1,151 @@
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from . import db
+from .models import Member, MembershipLog, Workout
+from .adminAuth import admin_required
+from datetime import datetime, timedelta
+from sqlalchemy import select
+import csv
+import io
+import json
+import pytz
+
+
+exports = Blueprint('exports', __name__)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Each dataset: output columns, the datetime column the start/end range applies to,
+# and the joins needed so type/status filter on the owning member.
+EXPORT_DATASETS = {
+    'members': {
+        'columns': [
+            Member.member_id, Member.unique_code, Member.first_name, Member.last_name,
+            Member.age, Member.gender, Member.member_type, Member.student_number,
+            Member.gym_plan, Member.email, Member.contact_number, Member.address,
+            Member.start_date, Member.end_date, Member.status, Member.date_registered,
+            Member.price_paid, Member.is_self_registered,
+        ],
+        'date_column': Member.date_registered,
+        'order_by': Member.member_id,
+        'join': None,
+    },
+    'logs': {
+        'columns': [
+            MembershipLog.log_id, MembershipLog.member_id, Member.unique_code,
+            MembershipLog.action_type, MembershipLog.action_date, MembershipLog.remarks,
+        ],
+        'date_column': MembershipLog.action_date,
+        'order_by': MembershipLog.log_id,
+        'join': (MembershipLog.member_id == Member.member_id),
+    },
+    'workouts': {
+        'columns': [
+            Workout.workout_id, Workout.member_id, Member.unique_code, Workout.workout_date,
+            Workout.exercise_type, Workout.duration_minutes, Workout.calories_burned, Workout.notes,
+        ],
+        'date_column': Workout.workout_date,
+        'order_by': Workout.workout_id,
+        'join': (Workout.member_id == Member.member_id),
+    },
+}
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid {name} date '{value}', expected YYYY-MM-DD.")
+
+
+def build_export_query(dataset, args):
+    """SELECT for one dataset with ?start=&end= (inclusive dates), ?type= and ?status= applied."""
+    spec = EXPORT_DATASETS[dataset]
+    stmt = select(*spec['columns'])
+    if spec['join'] is not None:
+        stmt = stmt.select_from(spec['columns'][0].class_).join(Member, spec['join'])
+
+    date_column = spec['date_column']
+    if args.get('start'):
+        stmt = stmt.where(date_column >= _parse_date(args['start'], 'start'))
+    if args.get('end'):
+        # Datetime column: include the whole end day
+        stmt = stmt.where(date_column < _parse_date(args['end'], 'end') + timedelta(days=1))
+    if args.get('type'):
+        stmt = stmt.where(Member.member_type == args['type'])
+    if args.get('status'):
+        stmt = stmt.where(Member.status == args['status'])
+
+    return stmt.order_by(spec['order_by'])
+
+
+# ========================================
+# ROW ENCODERS
+# ========================================
+def _iter_rows(stmt, batch_size):
+    """Yield lists of up to `batch_size` rows, fetched in batches (server-side cursor where supported)."""
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield partition
+
+
+def _format_value(value):
+    # Dates and datetimes as ISO 8601 in both formats
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def generate_csv(stmt, headers, batch_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for rows in _iter_rows(stmt, batch_size):
+        writer.writerows([_format_value(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Nothing matched: still send the header row
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def generate_ndjson(stmt, headers, batch_size):
+    for rows in _iter_rows(stmt, batch_size):
+        yield ''.join(
+            json.dumps({h: _format_value(v) for h, v in zip(headers, row)}) + '\n'
+            for row in rows
+        )
+
+
+# ========================================
+# EXPORT ENDPOINT
+# ========================================
+@exports.route('/admin/export/<dataset>', methods=['GET'])
+@admin_required
+def export_dataset(dataset):
+    """Stream members, logs or workouts as ?format=csv (default) or ndjson."""
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({"success": False, "error": f"Unknown export '{dataset}'."}), 404
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"success": False, "error": f"Unsupported format '{fmt}'."}), 400
+
+    try:
+        stmt = build_export_query(dataset, request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    headers = [column.key for column in EXPORT_DATASETS[dataset]['columns']]
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    generate = generate_csv if fmt == 'csv' else generate_ndjson
+
+    stamp = datetime.now(pytz.timezone('Asia/Manila')).strftime('%Y%m%d')
+    return Response(
+        stream_with_context(generate(stmt, headers, batch_size)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}-{stamp}.{fmt}"'}
+    )
@@ -0,0 +1,132 @@
+from flask import current_app
+from markupsafe import Markup, escape
+from .assets import asset_url
+import json
+import os
+
+
+# Landing page images with responsive variants (paths under static/)
+RESPONSIVE_IMAGES = [
+    'images/subscription_daily.png',
+    'images/subscription_monthly.png',
+    'images/subscription_annually.png',
+    'images/track_workouts.png',
+    'images/progress_analytics.png',
+    'images/set_goals.png',
+]
+RESPONSIVE_WIDTHS = (96, 192, 384, 768)
+RESPONSIVE_DIR = 'images/responsive'  # committed; regenerate with `flask build-images`
+RESPONSIVE_MANIFEST = 'responsive.json'
+
+# Best first: browsers take the first <source> type they support. The original file is the <img> fallback,
+# which only browsers without WebP support ever download.
+MODERN_FORMATS = [
+    ('avif', 'image/avif', {'quality': 55}),
+    ('webp', 'image/webp', {'quality': 80, 'method': 6}),
+]
+
+
+# ========================================
+# BUILD (offline; needs Pillow)
+# ========================================
+def build_images(static_dir):
+    """Write every width and format of RESPONSIVE_IMAGES to static/images/responsive.
+
+    Widths larger than the original are skipped. Returns the manifest:
+    {source: {"width", "height", "variants": {format: {width: file}}}}.
+    """
+    from PIL import Image  # optional: only this command needs it
+
+    out_dir = os.path.join(static_dir, RESPONSIVE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    for stale in os.listdir(out_dir):
+        os.remove(os.path.join(out_dir, stale))
+
+    manifest = {}
+    for source in RESPONSIVE_IMAGES:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        with Image.open(os.path.join(static_dir, source)) as original:
+            original.load()
+            width, height = original.size
+            variants = {}
+            for target in [w for w in RESPONSIVE_WIDTHS if w <= width]:
+                resized = original.resize((target, round(height * target / width)), Image.Resampling.LANCZOS)
+                for fmt, _, options in MODERN_FORMATS:
+                    name = f"{stem}-{target}.{fmt}"
+                    resized.save(os.path.join(out_dir, name), **options)
+                    variants.setdefault(fmt, {})[target] = f"{RESPONSIVE_DIR}/{name}"
+        manifest[source] = {"width": width, "height": height, "variants": variants}
+
+    with open(os.path.join(out_dir, RESPONSIVE_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+# ========================================
+# TEMPLATE HELPER
+# ========================================
+class ResponsiveImages:
+    """Reads the variants written by `flask build-images` and exposes responsive_image() to templates."""
+
+    def __init__(self):
+        self.app = None
+        self._manifest = None
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['responsive_images'] = self
+        app.jinja_env.globals.update(responsive_image=responsive_image)
+
+    def lookup(self, source):
+        if self._manifest is None or self.app.debug:
+            path = os.path.join(self.app.static_folder, RESPONSIVE_DIR, RESPONSIVE_MANIFEST)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            except OSError:
+                self._manifest = {}
+        return self._manifest.get(source)
+
+
+images = ResponsiveImages()
+
+
+def _srcset(files):
+    return ", ".join(f"{asset_url(name)} {width}w" for width, name in sorted(files.items(), key=lambda i: int(i[0])))
+
+
+def responsive_image(source, alt, sizes='100vw', lazy=True, **attrs):
+    """<picture> with AVIF/WebP srcsets for an image in RESPONSIVE_IMAGES, falling back to the original.
+
+    `sizes` is the displayed width (a CSS length or media list). Extra keyword
+    arguments become <img> attributes; a trailing underscore is dropped (class_=...).
+    Images without built variants get a plain <img>.
+    """
+    attrs = {name.rstrip('_').replace('_', '-'): value for name, value in attrs.items()}
+    if lazy:
+        attrs.setdefault('loading', 'lazy')
+        attrs.setdefault('decoding', 'async')
+
+    entry = images.lookup(source)
+    if entry is None:
+        current_app.logger.debug("No responsive variants for %s; run `flask build-images`", source)
+        img_attrs = {'src': asset_url(source), 'alt': alt, **attrs}
+        return Markup(f"<img {_attributes(img_attrs)}>")
+
+    variants = entry['variants']
+    sources = [
+        f'<source type="{mimetype}" srcset="{escape(_srcset(variants[fmt]))}" sizes="{escape(sizes)}">'
+        for fmt, mimetype, _ in MODERN_FORMATS if fmt in variants
+    ]
+    img_attrs = {
+        'src': asset_url(source),
+        'width': entry['width'],    # intrinsic size: the layout reserves the right box before loading
+        'height': entry['height'],
+        'alt': alt,
+        **attrs,
+    }
+    return Markup(f"<picture>{''.join(sources)}<img {_attributes(img_attrs)}></picture>")
+
+
+def _attributes(attrs):
+    return " ".join(f'{name}="{escape(value)}"' for name, value in attrs.items() if value is not None)
@@ -0,0 +1,201 @@
+from flask import Blueprint, request, jsonify, current_app
+from . import db, rollups
+from .models import Member, MembershipLog
+from .pricing import pricing
+from .adminAuth import admin_required
+from .cache import invalidate_member_data
+from .events import publish
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import insert
+import csv
+import io
+import pytz
+
+
+memberImport = Blueprint('memberImport', __name__)
+
+MEMBER_TYPES = ('Student', 'Faculty', 'Outsider')
+GYM_PLANS = ('Daily', 'Monthly', 'Annual')
+GENDERS = ('Male', 'Female')
+REQUIRED_FIELDS = ('first_name', 'last_name', 'member_type', 'gym_plan', 'start_date', 'end_date')
+
+
+# ========================================
+# PARSING & VALIDATION
+# ========================================
+def read_import_rows():
+    """Rows from an uploaded CSV ('file') or a JSON body (a list, or {"members": [...]})."""
+    upload = request.files.get('file')
+    if upload:
+        text = io.TextIOWrapper(upload.stream, encoding='utf-8-sig')
+        return list(csv.DictReader(text))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('members')
+    if not isinstance(data, list):
+        raise ValueError("Upload a CSV file or send JSON with a list of members.")
+    return data
+
+
+def validate_row(raw):
+    """Clean one input row. Returns (values, errors); values is None when errors is not empty."""
+    if not isinstance(raw, dict):
+        return None, ["Row must be an object."]
+
+    # Accept the add-member form names too (Start_date, End_date)
+    row = {str(k).strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in raw.items() if k}
+    errors = [f"{field} is required." for field in REQUIRED_FIELDS if not row.get(field)]
+
+    member_type = row.get('member_type')
+    if member_type and member_type not in MEMBER_TYPES:
+        errors.append(f"member_type must be one of {', '.join(MEMBER_TYPES)}.")
+    gym_plan = row.get('gym_plan')
+    if gym_plan and gym_plan not in GYM_PLANS:
+        errors.append(f"gym_plan must be one of {', '.join(GYM_PLANS)}.")
+    gender = row.get('gender') or None
+    if gender and gender not in GENDERS:
+        errors.append(f"gender must be one of {', '.join(GENDERS)}.")
+
+    age = row.get('age')
+    if age in ('', None):
+        age = None
+    else:
+        try:
+            age = int(age)
+        except (TypeError, ValueError):
+            errors.append("age must be a whole number.")
+
+    dates = {}
+    for field in ('start_date', 'end_date'):
+        if row.get(field):
+            try:
+                dates[field] = datetime.strptime(str(row[field]), '%Y-%m-%d').date()
+            except ValueError:
+                errors.append(f"{field} must be YYYY-MM-DD.")
+    if len(dates) == 2 and dates['end_date'] < dates['start_date']:
+        errors.append("end_date is before start_date.")
+
+    if errors:
+        return None, errors
+
+    return {
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+        'age': age,
+        'gender': gender,
+        'member_type': member_type,
+        'student_number': (row.get('student_number') or None) if member_type == 'Student' else None,
+        'gym_plan': gym_plan,
+        'email': row.get('email') or None,
+        'contact_number': row.get('contact_number') or None,
+        'address': row.get('address') or None,
+        'start_date': dates['start_date'],
+        'end_date': dates['end_date'],
+    }, []
+
+
+# ========================================
+# BULK INSERT
+# ========================================
+def import_members(rows, chunk_size=500):
+    """Insert validated rows and their 'Registered' logs in one transaction.
+
+    Codes are reserved in one block per member type and prices resolved once per
+    (type, plan). Returns [(member_id, unique_code), ...] in input order.
+    """
+    now = datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+
+    # --- One code block per type, handed out in input order ---
+    counts = defaultdict(int)
+    for row in rows:
+        counts[row['member_type']] += 1
+    codes = {member_type: iter(Member.reserve_unique_codes(member_type, count))
+             for member_type, count in counts.items()}
+
+    prices = {}
+    totals = defaultdict(lambda: [0, 0.0])  # (type, plan) -> [registrations, revenue]
+    for row in rows:
+        key = (row['member_type'], row['gym_plan'])
+        if key not in prices:
+            prices[key] = pricing.price_at(*key, now.date())
+        row.update(unique_code=next(codes[row['member_type']]), price_paid=prices[key],
+                   status='Active', date_registered=now, is_self_registered=False)
+        totals[key][0] += 1
+        totals[key][1] += prices[key]
+
+    created = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        member_ids = db.session.scalars(
+            insert(Member).returning(Member.member_id, sort_by_parameter_order=True),
+            chunk
+        ).all()
+        db.session.execute(insert(MembershipLog), [
+            {
+                'member_id': member_id,
+                'action_type': 'Registered',
+                'action_date': now,
+                'remarks': f"Member {row['first_name']} {row['last_name']} registered successfully (bulk import)."
+            }
+            for member_id, row in zip(member_ids, chunk)
+        ])
+        created.extend(zip(member_ids, (row['unique_code'] for row in chunk)))
+
+    for (member_type, gym_plan), (count, revenue) in totals.items():
+        rollups.bump(now.date(), member_type, gym_plan, registrations=count, revenue=revenue)
+
+    return created
+
+
+# ========================================
+# IMPORT ENDPOINT
+# ========================================
+@memberImport.route('/admin/import-members', methods=['POST'])
+@admin_required
+def import_members_route():
+    """All-or-nothing import: any invalid row rejects the whole file with a per-row report."""
+    try:
+        raw_rows = read_import_rows()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"success": False, "error": f"Could not read import: {str(e)}"}), 400
+
+    max_rows = current_app.config.get('IMPORT_MAX_ROWS', 20000)
+    if not raw_rows:
+        return jsonify({"success": False, "error": "No rows to import."}), 400
+    if len(raw_rows) > max_rows:
+        return jsonify({"success": False, "error": f"Too many rows ({len(raw_rows)}), the limit is {max_rows}."}), 400
+
+    rows, report = [], []
+    for number, raw in enumerate(raw_rows, start=1):
+        values, errors = validate_row(raw)
+        if errors:
+            report.append({"row": number, "errors": errors})
+        else:
+            rows.append(values)
+
+    if report:
+        return jsonify({
+            "success": False,
+            "error": f"{len(report)} of {len(raw_rows)} rows are invalid. Nothing was imported.",
+            "rows": report
+        }), 400
+
+    try:
+        created = import_members(rows, current_app.config.get('IMPORT_CHUNK_SIZE', 500))
+        publish('refresh', {"reason": "import", "count": len(created)})
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": f"Error importing members: {str(e)}"}), 500
+
+    invalidate_member_data()
+    return jsonify({
+        "success": True,
+        "message": f"Imported {len(created)} members.",
+        "rows": [
+            {"row": number, "member_id": member_id, "unique_code": unique_code}
+            for number, (member_id, unique_code) in enumerate(created, start=1)
+        ]
+    }), 200
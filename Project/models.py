@@ -1,7 +1,10 @@
 import pytz
 from . import db
+from .cache import invalidate_member_data, invalidate_user_data
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import and_, select
+from .passwords import passwords
+from .dbfuncs import upsert_insert
 
 
 # ========================================
@@ -14,10 +17,17 @@ class Admin(db.Model):
     password_hash = db.Column(db.String(200), nullable=False)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify(self.password_hash, password)
+
+    def rehash_password_if_needed(self, password):
+        """Re-hash with the current PASSWORD_HASH_METHOD after a successful login. Returns True if changed."""
+        if not passwords.needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        return True
 
 # =======================================
 # PRICE MODEL   
@@ -26,8 +36,8 @@ class GymPricing(db.Model):
     __tablename__ = 'gym_pricing'
 
     id = db.Column(db.Integer, primary_key=True)
-    member_type = db.Column(db.Enum('Student', 'Faculty', 'Outsider'), nullable=False)
-    plan_type = db.Column(db.Enum('Daily', 'Monthly', 'Annual'), nullable=False)
+    member_type = db.Column(db.Enum('Student', 'Faculty', 'Outsider', name='pricing_member_type'), nullable=False)
+    plan_type = db.Column(db.Enum('Daily', 'Monthly', 'Annual', name='pricing_plan_type'), nullable=False)
     price = db.Column(db.Float, nullable=False)
     effective_date = db.Column(db.Date, default=lambda: datetime.now(pytz.timezone('Asia/Manila')).date())
 
@@ -51,27 +61,94 @@ class PriceHistory(db.Model):
     def __repr__(self):
         return f"<PriceChange {self.member_type} - {self.plan_type}: ₱{self.old_price} → ₱{self.new_price}> "
 
+# =======================================
+# UNIQUE CODE SEQUENCE MODEL
+# =======================================
+CODE_PREFIXES = {
+    'Student': 'STU',
+    'Faculty': 'FCT',
+    'Outsider': 'OTD'
+}
+
+class CodeSequence(db.Model):
+    """Last unique_code number handed out per prefix (STU, FCT, OTD, ...)."""
+    __tablename__ = 'code_sequences'
+
+    prefix = db.Column(db.String(10), primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def reserve(cls, prefix, count=1):
+        """Atomically advance the counter by `count` and return the first reserved number.
+
+        The UPDATE row-locks the counter (a write lock on SQLite) until the caller's
+        transaction commits, so concurrent registrations can never get the same number.
+        If the transaction rolls back, the numbers are released with it.
+        """
+        table = cls.__table__
+        advance = (
+            table.update()
+            .where(table.c.prefix == prefix)
+            .values(last_value=table.c.last_value + count)
+        )
+        if db.session.execute(advance).rowcount == 0:
+            cls._seed(prefix)
+            db.session.execute(advance)
+
+        last_value = db.session.execute(
+            select(table.c.last_value).where(table.c.prefix == prefix)
+        ).scalar_one()
+        return last_value - count + 1
+
+    @classmethod
+    def _seed(cls, prefix):
+        """Create the counter at the highest existing code number (one-time scan per prefix)."""
+        existing_codes = Member.query.with_entities(Member.unique_code).filter(
+            Member.unique_code.like(f"{prefix}-%")
+        ).all()
+
+        max_num = 0
+        for code_tuple in existing_codes:
+            try:
+                max_num = max(max_num, int(code_tuple[0].split('-')[1]))
+            except (ValueError, IndexError):
+                pass
+
+        # Another process may seed the same prefix at the same time; first one wins
+        seed = upsert_insert(cls.__table__)
+        if seed is not None:
+            db.session.execute(
+                seed.values(prefix=prefix, last_value=max_num).on_conflict_do_nothing(index_elements=['prefix'])
+            )
+        else:
+            db.session.execute(cls.__table__.insert().values(prefix=prefix, last_value=max_num))
+
 # ========================================
 # MEMBER MODEL
 # ========================================
 class Member(db.Model):
     __tablename__ = 'members'
+    __table_args__ = (
+        db.Index('ix_members_status_end_date', 'status', 'end_date'),  # expiry sweep
+        db.Index('ix_members_type_registered', 'member_type', 'date_registered'),  # statistics
+        db.Index('ix_members_email', 'email'),  # user login / registration
+    )
 
     member_id = db.Column(db.Integer, primary_key=True)
     unique_code = db.Column(db.String(10), unique=True, nullable=False)
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     age = db.Column(db.Integer)
-    gender = db.Column(db.Enum('Male', 'Female'))
-    member_type = db.Column(db.Enum('Faculty', 'Outsider', 'Student'), nullable=False)
+    gender = db.Column(db.Enum('Male', 'Female', name='member_gender'))
+    member_type = db.Column(db.Enum('Faculty', 'Outsider', 'Student', name='member_type'), nullable=False)
     student_number = db.Column(db.String(20))
-    gym_plan = db.Column(db.Enum('Daily', 'Monthly', 'Annual'), nullable=False)
+    gym_plan = db.Column(db.Enum('Daily', 'Monthly', 'Annual', name='member_gym_plan'), nullable=False)
     email = db.Column(db.String(150))
     contact_number = db.Column(db.String(20))
     address = db.Column(db.String(255))
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
-    status = db.Column(db.Enum('Active', 'Inactive', 'Expired'), default='Active')
+    status = db.Column(db.Enum('Active', 'Inactive', 'Expired', name='member_status'), default='Active')
     date_registered = db.Column(db.DateTime, default=lambda: datetime.now(pytz.timezone('Asia/Manila')))
     price_paid = db.Column(db.Float, nullable=True)
 
@@ -81,6 +158,7 @@ class Member(db.Model):
 
     logs = db.relationship('MembershipLog', backref='member', lazy=True, cascade='all, delete-orphan')
     workouts = db.relationship('Workout', backref='member', lazy=True, cascade='all, delete-orphan')
+    workout_stats = db.relationship('WorkoutStats', uselist=False, lazy=True, cascade='all, delete-orphan')
 
     # Track original type
     _original_member_type = None
@@ -94,29 +172,14 @@ class Member(db.Model):
 
     def generate_unique_code(self, member_type):
         """Generate a truly unique code like STU-0001, avoiding duplicates even if records were deleted."""
-        prefix_map = {
-            'Student': 'STU',
-            'Faculty': 'FCT',
-            'Outsider': 'OTD'
-        }
-        prefix = prefix_map.get(member_type, 'MBR')
-
-        # Query all codes starting with the prefix
-        existing_codes = Member.query.with_entities(Member.unique_code).filter(
-            Member.unique_code.like(f"{prefix}-%")
-        ).all()
-
-        max_num = 0
-        for code_tuple in existing_codes:
-            code = code_tuple[0]
-            try:
-                num = int(code.split('-')[1])
-                max_num = max(max_num, num)
-            except (ValueError, IndexError):
-                pass
+        return Member.reserve_unique_codes(member_type, 1)[0]
 
-        # Always return one higher than the highest found
-        return f"{prefix}-{max_num + 1:04d}"
+    @staticmethod
+    def reserve_unique_codes(member_type, count):
+        """Claim a block of `count` consecutive codes for a member type in one round trip."""
+        prefix = CODE_PREFIXES.get(member_type, 'MBR')
+        first = CodeSequence.reserve(prefix, count)
+        return [f"{prefix}-{n:04d}" for n in range(first, first + count)]
 
     def update_member_type(self, new_type):
         """Smart update: regenerate unique_code if type changes."""
@@ -124,15 +187,10 @@ class Member(db.Model):
             self.member_type = new_type
             self.unique_code = self.generate_unique_code(new_type)
 
-    def get_current_price(self):
-        """Fetch the most recent price for this member's type and plan."""
-        latest_price = (
-            GymPricing.query
-            .filter_by(member_type=self.member_type, plan_type=self.gym_plan)
-            .order_by(GymPricing.effective_date.desc())
-            .first()
-        )
-        return latest_price.price if latest_price else 0.0
+    def get_current_price(self, on_date=None):
+        """Price in effect for this member's type and plan (today by default)."""
+        from .pricing import pricing
+        return pricing.price_at(self.member_type, self.gym_plan, on_date)
 
     def set_registration_price(self):
         """Set price_paid when the member registers."""
@@ -143,34 +201,81 @@ class Member(db.Model):
     # ========================================
     def set_password(self, password):
         """Hash and set password for user authentication."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash(password)
 
     def check_password(self, password):
         """Verify password for user authentication."""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify(self.password_hash, password)
+
+    def rehash_password_if_needed(self, password):
+        """Re-hash with the current PASSWORD_HASH_METHOD after a successful login. Returns True if changed."""
+        if not self.password_hash or not passwords.needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        return True
 
     # ========================================
     # AUTO STATUS CHECKER
     # ========================================
-    def check_and_update_status(self):
-        """Automatically update member status based on current date."""
+    @staticmethod
+    def derive_status(status, end_date, today=None):
+        """Status as of `today`, computed from end_date without touching the database."""
+        if today is None:
+            today = datetime.now(pytz.timezone('Asia/Manila')).date()
+
+        if today > end_date:
+            return 'Expired'
+        if status == 'Expired':
+            # Revive the member if extended manually
+            return 'Active'
+        return status
+
+    @property
+    def effective_status(self):
+        """Current status for display; the stored status catches up on the next maintenance sweep."""
+        return self.derive_status(self.status, self.end_date)
+
+    @classmethod
+    def sync_account_statuses(cls):
+        """Apply the derive_status rules to every member with a login account, in two set-based updates.
+
+        Run by the maintenance scheduler so user pages don't have to write on every view.
+        Returns the number of members whose status changed.
+        """
+        from . import rollups  # rollups and events import this module
+        from .events import publish
+
         current_date = datetime.now(pytz.timezone('Asia/Manila')).date()
+        has_account = cls.password_hash.isnot(None)
+
+        to_expire = and_(has_account, cls.end_date < current_date, cls.status != 'Expired')
+        rollups.record_bulk_status_change(to_expire, 'Expired')
+        expired = cls.query.filter(to_expire).update({cls.status: 'Expired'}, synchronize_session=False)
 
-        if current_date > self.end_date:
-            self.status = 'Expired'
-        elif self.status == 'Expired' and current_date <= self.end_date:
-            # Optional: revive the member if extended manually
-            self.status = 'Active'
+        # Revive members whose membership was extended manually
+        to_revive = and_(has_account, cls.end_date >= current_date, cls.status == 'Expired')
+        rollups.record_bulk_status_change(to_revive, 'Active')
+        revived = cls.query.filter(to_revive).update({cls.status: 'Active'}, synchronize_session=False)
 
+        if expired or revived:
+            publish('refresh', {"reason": "account_statuses", "count": expired + revived})
         db.session.commit()
 
+        if expired or revived:
+            invalidate_member_data()
+            invalidate_user_data()
+        return expired + revived
+
 # ========================================
 # MEMBERSHIP LOG MODEL
 # ========================================
 class MembershipLog(db.Model):
     __tablename__ = 'membership_logs'
+    __table_args__ = (
+        db.Index('ix_membership_logs_action_date', 'action_date', 'log_id'),  # logs feed
+    )
 
     log_id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.member_id', ondelete='CASCADE'), nullable=False)
@@ -181,11 +286,68 @@ class MembershipLog(db.Model):
     def __repr__(self):
         return f"<Log {self.action_type} for Member {self.member_id}>"
 
+# ========================================
+# ADMIN EVENT MODEL
+# ========================================
+class AdminEvent(db.Model):
+    """Dashboard deltas for the admin push channel, written in the same transaction as the change."""
+    __tablename__ = 'admin_events'
+    __table_args__ = (
+        db.Index('ix_admin_events_created_at', 'created_at'),  # pruning
+        {'sqlite_autoincrement': True},  # never reuse ids, even after pruning empties the table
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(32), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(pytz.timezone('Asia/Manila')))
+
+    def __repr__(self):
+        return f"<AdminEvent {self.id} {self.event_type}>"
+
+# ========================================
+# DATA VERSION MODEL
+# ========================================
+class DataVersion(db.Model):
+    """A counter bumped by every commit that writes the data behind a group of endpoints (ETags)."""
+    __tablename__ = 'data_versions'
+
+    name = db.Column(db.String(32), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)  # Asia/Manila, for Last-Modified
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}={self.version}>"
+
+# ========================================
+# DAILY ROLLUP MODEL
+# ========================================
+class DailyRollup(db.Model):
+    """Per-day registration, revenue and status-change counters, kept in step with writes."""
+    __tablename__ = 'daily_rollups'
+
+    local_date = db.Column(db.Date, primary_key=True)  # Asia/Manila calendar day
+    member_type = db.Column(db.String(20), primary_key=True)
+    gym_plan = db.Column(db.String(20), primary_key=True)
+    registrations = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    activations = db.Column(db.Integer, nullable=False, default=0)    # status changed to Active
+    expirations = db.Column(db.Integer, nullable=False, default=0)    # status changed to Expired
+    deactivations = db.Column(db.Integer, nullable=False, default=0)  # status changed to Inactive
+    deletions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<Rollup {self.local_date} {self.member_type}/{self.gym_plan}: {self.registrations} reg, ₱{self.revenue}>"
+
 # ========================================
 # WORKOUT MODEL
 # ========================================
 class Workout(db.Model):
     __tablename__ = 'workouts'
+    __table_args__ = (
+        db.Index('ix_workouts_member_date', 'member_id', 'workout_date'),  # streaks and dashboards
+        db.Index('uq_workouts_member_idempotency_key', 'member_id', 'idempotency_key', unique=True),  # retried uploads
+    )
 
     workout_id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.member_id', ondelete='CASCADE'), nullable=False)
@@ -195,6 +357,23 @@ class Workout(db.Model):
     calories_burned = db.Column(db.Integer, nullable=True)
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(pytz.timezone('Asia/Manila')))
+    idempotency_key = db.Column(db.String(64), nullable=True)  # client-chosen, unique per member
 
     def __repr__(self):
         return f"<Workout {self.exercise_type} - {self.duration_minutes} min by Member {self.member_id}>"
+
+# ========================================
+# WORKOUT STATS MODEL
+# ========================================
+class WorkoutStats(db.Model):
+    """Per-member workout totals, updated in the same transaction as workout writes."""
+    __tablename__ = 'workout_stats'
+
+    member_id = db.Column(db.Integer, db.ForeignKey('members.member_id', ondelete='CASCADE'), primary_key=True)
+    total_workouts = db.Column(db.Integer, nullable=False, default=0)
+    total_minutes = db.Column(db.Integer, nullable=False, default=0)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)  # consecutive days ending on last_workout_date
+    last_workout_date = db.Column(db.Date, nullable=True)  # Asia/Manila calendar day
+
+    def __repr__(self):
+        return f"<WorkoutStats Member {self.member_id}: {self.total_workouts} workouts, {self.total_minutes} min>"
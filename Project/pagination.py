@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+
+# ========================================
+# CURSOR ENCODING
+# ========================================
+def encode_cursor(values):
+    """Pack the last row's sort values into an opaque, URL-safe cursor."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Unpack a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor.') from e
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def coerce_cursor_value(column, value):
+    """Turn a JSON cursor value back into the Python type of its column."""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+# ========================================
+# KEYSET FILTER
+# ========================================
+def keyset_filter(columns, values, descending=False):
+    """Build the "rows after this cursor" condition for an ORDER BY over columns.
+
+    For (a, b) ascending this is: a > va OR (a = va AND b > vb), which lets the
+    database seek straight into an index instead of counting past an OFFSET.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        ties = [columns[j] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*ties, step))
+    return or_(*clauses)
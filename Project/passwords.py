@@ -0,0 +1,89 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HasherBusyError(RuntimeError):
+    """Too many password hashes are already queued; the caller should ask the user to retry."""
+
+
+# ========================================
+# PASSWORD HASHER
+# ========================================
+class PasswordHasher:
+    """Runs password hashing on a small, bounded thread pool.
+
+    scrypt and pbkdf2 release the GIL while they work, so PASSWORD_HASH_WORKERS
+    threads hash in parallel while the remaining cores keep serving other requests.
+    At most PASSWORD_HASH_QUEUE hashes wait for a worker; beyond that, or after
+    PASSWORD_HASH_TIMEOUT seconds of waiting, HasherBusyError is raised instead of
+    piling up request threads.
+    """
+
+    def __init__(self):
+        self.method = 'scrypt'
+        self.workers = 1
+        self.timeout = 10
+        self._slots = threading.BoundedSemaphore(1)
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._method_prefix = None
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt')  # any Werkzeug method, e.g. 'scrypt:16384:8:1', 'pbkdf2:sha256:600000'
+        app.config.setdefault('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2))
+        app.config.setdefault('PASSWORD_HASH_QUEUE', 64)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)
+
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(self.workers + app.config['PASSWORD_HASH_QUEUE'])
+        self._method_prefix = None
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Created lazily so each pre-forked worker process gets its own threads
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._executor_lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusyError("Password hashing queue is full.")
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot frees up when the hash finishes (or is cancelled), not when the caller gives up
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HasherBusyError("Password hashing timed out.")
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different method or cost than PASSWORD_HASH_METHOD."""
+        if self._method_prefix is None:
+            # Expand shorthands like 'scrypt' to the full 'scrypt:32768:8:1' Werkzeug writes
+            self._method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._method_prefix
+
+
+passwords = PasswordHasher()
@@ -0,0 +1,107 @@
+import threading
+import time
+import pytz
+from bisect import bisect_right
+from datetime import date, datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . import db
+from .models import GymPricing
+
+
+# ========================================
+# PRICING RESOLVER
+# ========================================
+class PricingResolver:
+    """In-memory (member_type, plan_type) -> effective-date timeline of GymPricing.
+
+    "Price at date D" is the price with the latest effective_date on or before D,
+    found with a binary search. The timeline is reloaded after a GymPricing write
+    commits in this process, and at least every PRICING_CACHE_TTL seconds so price
+    changes made by other workers are picked up too.
+    """
+
+    def __init__(self):
+        self.ttl = 300
+        self._timelines = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('PRICING_CACHE_TTL', 300)
+        self.ttl = app.config['PRICING_CACHE_TTL']
+        self.invalidate()
+
+    def invalidate(self):
+        self._timelines = None
+
+    def _load(self):
+        rows = (
+            db.session.query(GymPricing.member_type, GymPricing.plan_type,
+                             GymPricing.effective_date, GymPricing.price)
+            .order_by(GymPricing.effective_date, GymPricing.id)
+            .all()
+        )
+        timelines = {}
+        for member_type, plan_type, effective_date, price in rows:
+            dates, prices = timelines.setdefault((member_type, plan_type), ([], []))
+            dates.append(effective_date or date.min)
+            prices.append(price)
+        return timelines
+
+    def _get_timelines(self):
+        timelines = self._timelines
+        if timelines is None or time.time() - self._loaded_at > self.ttl:
+            with self._lock:
+                timelines = self._timelines
+                if timelines is None or time.time() - self._loaded_at > self.ttl:
+                    timelines = self._load()
+                    self._timelines = timelines
+                    self._loaded_at = time.time()
+        return timelines
+
+    def price_at(self, member_type, plan_type, on_date=None):
+        """Price for a type/plan on a date (default: today in Manila). 0.0 if unpriced."""
+        if on_date is None:
+            on_date = datetime.now(pytz.timezone('Asia/Manila')).date()
+
+        timeline = self._get_timelines().get((member_type, plan_type))
+        if not timeline:
+            return 0.0
+
+        dates, prices = timeline
+        # Rightmost entry effective on or before the date; same-day entries resolve to the newest
+        i = bisect_right(dates, on_date) - 1
+        # Dates before the first price fall back to the earliest known price
+        return prices[max(i, 0)]
+
+
+pricing = PricingResolver()
+
+
+# ========================================
+# INVALIDATION ON PRICE CHANGES
+# ========================================
+@event.listens_for(Session, 'after_flush')
+def _track_pricing_writes(session, flush_context):
+    if any(isinstance(obj, GymPricing) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['pricing_changed'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_pricing_writes(orm_execute_state):
+    # Query.update()/delete() and update(GymPricing) statements skip the flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        if any(mapper.class_ is GymPricing for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info['pricing_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _reload_pricing_after_commit(session):
+    if session.info.pop('pricing_changed', False):
+        pricing.invalidate()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_pricing_writes(session, previous_transaction):
+    session.info.pop('pricing_changed', None)
@@ -0,0 +1,141 @@
+import pytz
+from datetime import datetime
+from sqlalchemy import func, insert, select, literal
+from . import db
+from .models import DailyRollup, Member, MembershipLog
+from .dbfuncs import day_bucket, upsert_insert
+
+COUNTERS = ('registrations', 'revenue', 'activations', 'expirations', 'deactivations', 'deletions')
+
+# Which counter a status change lands in
+STATUS_COUNTERS = {
+    'Active': 'activations',
+    'Expired': 'expirations',
+    'Inactive': 'deactivations',
+}
+
+
+def _today():
+    return datetime.now(pytz.timezone('Asia/Manila')).date()
+
+
+# ========================================
+# INCREMENTAL UPDATES (call before the write's commit)
+# ========================================
+def bump(day, member_type, gym_plan, **deltas):
+    """Add deltas to one (day, type, plan) row inside the current transaction."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    table = DailyRollup.__table__
+    values = {name: 0 for name in COUNTERS}
+    values.update(deltas, local_date=day, member_type=member_type, gym_plan=gym_plan)
+
+    upsert = upsert_insert(table)
+    if upsert is not None:
+        upsert = upsert.values(**values)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=['local_date', 'member_type', 'gym_plan'],
+            set_={name: table.c[name] + upsert.excluded[name] for name in deltas}
+        )
+        db.session.execute(upsert)
+        return
+
+    # Other databases: update, then insert if the row didn't exist yet
+    key = (table.c.local_date == day) & (table.c.member_type == member_type) & (table.c.gym_plan == gym_plan)
+    result = db.session.execute(
+        table.update().where(key).values({name: table.c[name] + value for name, value in deltas.items()})
+    )
+    if result.rowcount == 0:
+        db.session.execute(table.insert().values(**values))
+
+
+def record_registration(member, sign=1):
+    """Count a member (sign=1) or take it back out (sign=-1) on its registration day."""
+    registered = member.date_registered or datetime.now(pytz.timezone('Asia/Manila'))
+    bump(registered.date(), member.member_type, member.gym_plan,
+         registrations=sign, revenue=sign * (member.price_paid or 0.0))
+
+
+def record_reclassification(member, old_type, old_plan):
+    """Move a member's registration to its new (type, plan) bucket after an edit."""
+    if (old_type, old_plan) == (member.member_type, member.gym_plan):
+        return
+    registered = member.date_registered or datetime.now(pytz.timezone('Asia/Manila'))
+    price = member.price_paid or 0.0
+    bump(registered.date(), old_type, old_plan, registrations=-1, revenue=-price)
+    bump(registered.date(), member.member_type, member.gym_plan, registrations=1, revenue=price)
+
+
+def record_status_change(member_type, gym_plan, old_status, new_status, count=1):
+    """Count status transitions that happened today."""
+    if old_status == new_status or new_status not in STATUS_COUNTERS:
+        return
+    bump(_today(), member_type, gym_plan, **{STATUS_COUNTERS[new_status]: count})
+
+
+def record_bulk_status_change(condition, new_status):
+    """Count a set-based status UPDATE. Call with its WHERE clause before running it."""
+    groups = (
+        db.session.query(Member.member_type, Member.gym_plan, func.count(Member.member_id))
+        .filter(condition)
+        .group_by(Member.member_type, Member.gym_plan)
+        .all()
+    )
+    for member_type, gym_plan, count in groups:
+        record_status_change(member_type, gym_plan, None, new_status, count)
+
+
+def record_deletion(member):
+    """Remove a deleted member's registration and count the deletion today."""
+    record_registration(member, sign=-1)
+    bump(_today(), member.member_type, member.gym_plan, deletions=1)
+
+
+# ========================================
+# FULL REBUILD (backfill / repair)
+# ========================================
+def rebuild():
+    """Recompute every rollup row from members and membership logs.
+
+    Registrations and revenue come from the current members table. Expirations
+    come from the sweep's 'Status Update' logs. Other status changes and
+    deletions leave no trace in the data, so they restart from zero.
+    Returns the number of rollup rows written.
+    """
+    table = DailyRollup.__table__
+    registered = day_bucket(Member.date_registered)
+    expired_on = day_bucket(MembershipLog.action_date)
+
+    try:
+        db.session.execute(table.delete())
+
+        db.session.execute(insert(table).from_select(
+            ['local_date', 'member_type', 'gym_plan', 'registrations', 'revenue',
+             'activations', 'expirations', 'deactivations', 'deletions'],
+            select(
+                registered, Member.member_type, Member.gym_plan,
+                func.count(Member.member_id), func.coalesce(func.sum(Member.price_paid), 0.0),
+                literal(0), literal(0), literal(0), literal(0)
+            )
+            .where(Member.date_registered.isnot(None))
+            .group_by(registered, Member.member_type, Member.gym_plan)
+        ))
+
+        expirations = (
+            db.session.query(expired_on, Member.member_type, Member.gym_plan, func.count(MembershipLog.log_id))
+            .join(Member, MembershipLog.member_id == Member.member_id)
+            .filter(MembershipLog.action_type == 'Status Update')
+            .group_by(expired_on, Member.member_type, Member.gym_plan)
+            .all()
+        )
+        for day, member_type, gym_plan, count in expirations:
+            bump(day, member_type, gym_plan, expirations=count)
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return db.session.query(func.count()).select_from(table).scalar()
@@ -0,0 +1,155 @@
+import os
+import threading
+from . import db
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ========================================
+# MAINTENANCE SCHEDULER
+# ========================================
+class MaintenanceScheduler:
+    """Runs membership maintenance jobs on an interval, off the request path.
+
+    Jobs run on a daemon thread inside the web process, or in the foreground via
+    `flask run-maintenance` when deployed as a sidecar. An OS lock on a file in the
+    instance folder makes sure only one process runs the jobs at a time.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.jobs = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._lock_fd = None
+
+    def init_app(self, app):
+        app.config.setdefault('MAINTENANCE_ENABLED', True)      # start the in-process thread
+        app.config.setdefault('MAINTENANCE_INTERVAL', 60)       # seconds between runs
+        self.app = app
+
+        # Start on the first request so CLI commands (db upgrade, etc.) never spawn the thread
+        if app.config['MAINTENANCE_ENABLED']:
+            app.before_request(self._start_once)
+
+    def add_job(self, name, func):
+        """Register (or replace) a callable to run on every tick. It runs inside an app context."""
+        self.jobs[name] = func
+
+    # ----------------------------------------
+    # Running jobs
+    # ----------------------------------------
+    def run_once(self):
+        """Run every job once. Returns {job name: result}, or None if another run holds the lock."""
+        if not self._run_lock.acquire(blocking=False):
+            return None
+        try:
+            if not self._acquire_file_lock():
+                return None
+            try:
+                return self._run_jobs()
+            finally:
+                self._release_file_lock()
+        finally:
+            self._run_lock.release()
+
+    def _run_jobs(self):
+        results = {}
+        with self.app.app_context():
+            for name, func in self.jobs.items():
+                try:
+                    results[name] = func()
+                except Exception as e:
+                    db.session.rollback()
+                    results[name] = None
+                    self.app.logger.exception("Maintenance job %s failed: %s", name, e)
+        return results
+
+    def run_forever(self):
+        """Run jobs every MAINTENANCE_INTERVAL seconds until stop() is called."""
+        interval = self.app.config['MAINTENANCE_INTERVAL']
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(interval)
+
+    # ----------------------------------------
+    # Background thread
+    # ----------------------------------------
+    def _start_once(self):
+        if self._thread is None:
+            self.start()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='maintenance-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # ----------------------------------------
+    # Cross-process lock
+    # ----------------------------------------
+    @property
+    def lock_path(self):
+        return os.path.join(self.app.instance_path, 'maintenance.lock')
+
+    def _acquire_file_lock(self):
+        # The file stays in place; only the lock on it comes and goes. The OS drops the lock
+        # when the holder exits or crashes, so there is never a stale lock to take over.
+        os.makedirs(self.app.instance_path, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # Holder's pid, for whoever is looking at the file
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, str(os.getpid()).encode())
+        self._lock_fd = fd
+        return True
+
+    def _release_file_lock(self):
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+scheduler = MaintenanceScheduler()
+
+
+def register_default_jobs(scheduler):
+    """The membership maintenance that used to run inside read endpoints."""
+    from .addMember import auto_update_expired_members
+    from .models import Member
+    from .events import prune_admin_events
+
+    scheduler.add_job('expire_members', auto_update_expired_members)
+    scheduler.add_job('sync_account_statuses', Member.sync_account_statuses)
+    scheduler.add_job('prune_admin_events', prune_admin_events)
@@ -0,0 +1,42 @@
+from . import db
+from .models import Admin, GymPricing
+
+
+DEFAULT_ADMIN_USERNAME = 'admin'
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+
+DEFAULT_PRICES = [
+    ('Student', 'Daily', 40),
+    ('Faculty', 'Daily', 40),
+    ('Outsider', 'Daily', 60),
+    ('Student', 'Monthly', 500),
+    ('Faculty', 'Monthly', 500),
+    ('Outsider', 'Monthly', 800),
+]
+
+
+# ========================================
+# DEFAULT DATA
+# ========================================
+def seed_defaults():
+    """Add the default admin and starting prices if they are missing. Returns what was added.
+
+    `flask db upgrade` seeds the same rows through a migration; this is for databases
+    built with db.create_all() (test fixtures, scratch copies). Caller commits.
+    """
+    added = []
+
+    if not db.session.query(Admin.id).filter_by(username=DEFAULT_ADMIN_USERNAME).first():
+        admin = Admin(username=DEFAULT_ADMIN_USERNAME)
+        admin.set_password(DEFAULT_ADMIN_PASSWORD)
+        db.session.add(admin)
+        added.append(f"admin '{DEFAULT_ADMIN_USERNAME}'")
+
+    if not db.session.query(GymPricing.id).first():
+        db.session.add_all(
+            GymPricing(member_type=member_type, plan_type=plan_type, price=price)
+            for member_type, plan_type, price in DEFAULT_PRICES
+        )
+        added.append(f"{len(DEFAULT_PRICES)} prices")
+
+    return added
@@ -0,0 +1,97 @@
+// ========================================
+// ADMIN EVENTS - live dashboard deltas over Server-Sent Events
+// ========================================
+// Usage: adminEvents.on("member" | "log" | "refresh" | "ready" | "offline", handler)
+// The stream opens on the first subscription, so pages without live widgets never connect.
+window.adminEvents = (() => {
+    const EVENT_TYPES = ["ready", "member", "log", "refresh"];
+    const RETRY_MS = 60000;
+    const handlers = {};
+    let source = null;
+
+    function dispatch(type, data) {
+        (handlers[type] || []).forEach(handler => {
+            try {
+                handler(data);
+            } catch (err) {
+                console.error(`Admin event handler for "${type}" failed:`, err);
+            }
+        });
+    }
+
+    function connect() {
+        if (source) return;
+        if (!window.EventSource) {
+            setTimeout(() => dispatch("offline", {}), 0);
+            return;
+        }
+
+        source = new EventSource("/admin/events");
+        EVENT_TYPES.forEach(type => {
+            source.addEventListener(type, e => dispatch(type, JSON.parse(e.data)));
+        });
+        source.onerror = () => {
+            // Dropped streams reconnect by themselves (resuming from Last-Event-ID);
+            // a refused one (401, or 503 when the server is full) stays closed
+            if (source.readyState === EventSource.CLOSED) {
+                source = null;
+                dispatch("offline", {});
+                setTimeout(connect, RETRY_MS);
+            }
+        };
+    }
+
+    function on(type, handler) {
+        (handlers[type] = handlers[type] || []).push(handler);
+        connect();
+    }
+
+    // Keep a snapshot in step: load it once the stream is ready, then apply member deltas.
+    // A delta that lands while loading may or may not be in the response, so load again.
+    function liveSnapshot(load, applyMember) {
+        let loaded = false;
+        let loading = false;
+        let stale = false;
+        let reloadTimer = null;
+
+        async function reload() {
+            if (loading) {
+                stale = true;
+                return;
+            }
+            loading = true;
+            try {
+                do {
+                    // Give the writer a moment to clear the server-side cache
+                    if (stale) await new Promise(resolve => setTimeout(resolve, 500));
+                    stale = false;
+                    await load();
+                } while (stale);
+                loaded = true;
+            } catch (err) {
+                console.error("Dashboard snapshot failed:", err);
+            } finally {
+                loading = false;
+            }
+        }
+
+        on("ready", ({ resumed }) => { if (!resumed || !loaded) reload(); });
+        on("offline", reload);  // no stream: refresh once per reconnect attempt instead
+        on("refresh", () => {
+            clearTimeout(reloadTimer);
+            reloadTimer = setTimeout(reload, 500);
+        });
+        on("member", data => {
+            if (loading) stale = true;
+            else if (loaded) applyMember(data);
+        });
+    }
+
+    return {
+        on,
+        liveSnapshot,
+        get live() {
+            return source !== null && source.readyState === EventSource.OPEN;
+        }
+    };
+})();
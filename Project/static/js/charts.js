@@ -135,9 +135,63 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     });
 
-    // Fetch data once, then render all charts
-    fetch("/admin/dashboard-summary")
-        .then(res => res.json())
-        .then(data => initCharts(data))
-        .catch(err => console.error("Dashboard load failed:", err));
+    // Apply a member delta (see member_snapshot in events.py) to the loaded summary
+    const SERIES = { Student: "students", Faculty: "faculty", Outsider: "outsiders" };
+    let snapshot = null;
+
+    const applyMember = (member, sign) => {
+        if (!member) return;
+        snapshot.summary.total += sign;
+        const statusIndex = snapshot.status_overview.labels.indexOf(member.status);
+        if (statusIndex >= 0) snapshot.status_overview.values[statusIndex] += sign;
+        if (member.status !== "Active") return;
+
+        snapshot.summary.active += sign;
+        const typeIndex = snapshot.status_chart.labels.indexOf(member.member_type);
+        if (typeIndex >= 0) snapshot.status_chart.values[typeIndex] += sign;
+        member.months.forEach(label => {
+            const monthIndex = snapshot.overview_chart.labels.indexOf(label);
+            if (monthIndex >= 0) snapshot.overview_chart[SERIES[member.member_type]][monthIndex] += sign;
+        });
+    };
+
+    const updateCharts = () => {
+        const { labels, values } = snapshot.status_chart;
+        snapshot.summary.most_active = labels[values.indexOf(Math.max(...values))];
+        totalEl.textContent = snapshot.summary.total.toLocaleString();
+        activeEl.textContent = snapshot.summary.active.toLocaleString();
+        mostActiveEl.textContent = snapshot.summary.most_active;
+
+        if (membershipChart) {
+            ["students", "faculty", "outsiders"].forEach((key, i) => {
+                membershipChart.data.datasets[i].data = snapshot.overview_chart[key];
+            });
+            membershipChart.update();
+        }
+        if (renewalChart) {
+            renewalChart.data.datasets[0].data = snapshot.status_overview.values;
+            renewalChart.update();
+        }
+        if (expirationChart) {
+            expirationChart.data.datasets[0].data = snapshot.status_chart.values;
+            expirationChart.update();
+        }
+    };
+
+    const loadSnapshot = async () => {
+        const res = await fetch("/admin/dashboard-summary");
+        snapshot = await res.json();
+        initCharts(snapshot);
+    };
+
+    if (document.getElementById("membershipChart")) {
+        // Dashboard: load once, then follow live deltas
+        adminEvents.liveSnapshot(loadSnapshot, ({ before, after }) => {
+            applyMember(before, -1);
+            applyMember(after, 1);
+            updateCharts();
+        });
+    } else {
+        loadSnapshot().catch(err => console.error("Dashboard load failed:", err));
+    }
 });
@@ -51,19 +51,24 @@ const announcements = [
 let index = 0;
 const textElement = document.getElementById("announcementText");
 
-setInterval(() => {
-    index = (index + 1) % announcements.length;
-    textElement.style.opacity = 0;
-    setTimeout(() => {
-        textElement.textContent = announcements[index];
-        textElement.style.opacity = 1;
-    }, 500);
-}, 3500);
+// This script is loaded on every page (and bundled with the others), so only
+// wire up elements that the current page actually has
+if (textElement) {
+    setInterval(() => {
+        index = (index + 1) % announcements.length;
+        textElement.style.opacity = 0;
+        setTimeout(() => {
+            textElement.textContent = announcements[index];
+            textElement.style.opacity = 1;
+        }, 500);
+    }, 3500);
+}
 
 // Handle Passwords
 const togglePassword = document.getElementById('togglePassword');
-    const passwordInput = document.getElementById('password');
+const passwordInput = document.getElementById('password');
 
+if (togglePassword && passwordInput) {
     togglePassword.addEventListener('click', () => {
         const type = passwordInput.getAttribute('type') === 'password' ? 'text' : 'password';
         passwordInput.setAttribute('type', type);
@@ -71,4 +76,5 @@ const togglePassword = document.getElementById('togglePassword');
         // Toggle icon
         togglePassword.classList.toggle('fa-eye');
         togglePassword.classList.toggle('fa-eye-slash');
-});
\ No newline at end of file
+    });
+}
@@ -1,38 +1,119 @@
 document.addEventListener("DOMContentLoaded", async () => {
     // ================== REVENUE STATS ==================
-    try {
-        const res = await fetch("/admin/members-statistics");
-        const data = await res.json();
-        const { stats } = data;
+    let stats = null;
 
+    const renderRevenue = () => {
         document.getElementById("dailyRevenueDisplay").textContent = `₱${stats.daily_revenue.toFixed(2)}`;
         document.getElementById("monthlyRevenueDisplay").textContent = `₱${stats.monthly_revenue.toFixed(2)}`;
         document.getElementById("totalRevenueDisplay").textContent = `₱${stats.total_revenue.toFixed(2)}`;
         document.getElementById("revenueTimestamp").textContent = `Last updated: ${new Date().toLocaleString()}`;
-    } catch (err) { 
-        console.error("Error fetching revenue stats:", err); 
+    };
+
+    const loadRevenue = async () => {
+        const res = await fetch("/admin/members-statistics");
+        const data = await res.json();
+        stats = data.stats;
+        renderRevenue();
+    };
+
+    // Revenue counts on the registration day, so a member delta moves it there
+    const applyRevenue = (member, sign, today) => {
+        if (!member) return;
+        const amount = sign * member.price_paid;
+        stats.total_revenue += amount;
+        if (member.registered.slice(0, 7) === today.slice(0, 7)) stats.monthly_revenue += amount;
+        if (member.registered === today) stats.daily_revenue += amount;
+    };
+
+    if (document.getElementById("dailyRevenueDisplay")) {
+        adminEvents.liveSnapshot(loadRevenue, ({ before, after, today }) => {
+            applyRevenue(before, -1, today);
+            applyRevenue(after, 1, today);
+            renderRevenue();
+        });
+    } else {
+        try {
+            await loadRevenue();
+        } catch (err) {
+            console.error("Error fetching revenue stats:", err);
+        }
     }
 
     // ================== MEMBERSHIP LOGS ==================
-    try {
-        const res = await fetch("/admin/membership-logs");
-        const logs = await res.json();
-        const logList = document.getElementById("logList");
-        logList.innerHTML = "";
+    // First page on load, older pages while scrolling, new entries pushed over the event
+    // stream (or polled every 30s when it is unavailable)
+    const LOG_POLL_MS = 30000;
+    const logList = document.getElementById("logList");
+    const shownLogs = new Set();
+    let nextCursor = null;
+    let latestId = null;
+    let loadingOlder = false;
+
+    const logItem = (log) => {
+        const li = document.createElement("li");
+        li.textContent = `[${log.action_date}] ${log.member_name} — ${log.action_type}`;
+        return li;
+    };
 
-        const oneWeekAgo = new Date();
-        oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
+    const addNewLog = (log) => {
+        latestId = Math.max(latestId ?? 0, log.log_id);
+        if (shownLogs.has(log.log_id)) return;
+        shownLogs.add(log.log_id);
+        logList.prepend(logItem(log));
+    };
+
+    const loadOlderLogs = async () => {
+        if (loadingOlder) return;
+        loadingOlder = true;
+        try {
+            const query = nextCursor ? `?cursor=${encodeURIComponent(nextCursor)}` : "";
+            const res = await fetch(`/admin/membership-logs${query}`);
+            const data = await res.json();
+            data.logs.forEach(log => {
+                if (shownLogs.has(log.log_id)) return;
+                shownLogs.add(log.log_id);
+                logList.appendChild(logItem(log));
+            });
+            nextCursor = data.next_cursor;
+            if (latestId === null) latestId = data.latest_id;
+        } catch (err) {
+            console.error("Error fetching membership logs:", err);
+        } finally {
+            loadingOlder = false;
+        }
+    };
 
-        logs.forEach(log => {
-            const logDate = new Date(log.action_date);
-            if (logDate >= oneWeekAgo) {
-                const li = document.createElement("li");
-                li.textContent = `[${log.action_date}] ${log.member_name} — ${log.action_type}`;
-                logList.appendChild(li);
+    const pollNewLogs = async () => {
+        if (latestId === null || document.hidden) return;
+        try {
+            let more = true;
+            while (more) {
+                const res = await fetch(`/admin/membership-logs?since_id=${latestId}`);
+                const data = await res.json();
+                // Oldest first, so prepending each one leaves the newest on top
+                data.logs.forEach(addNewLog);
+                latestId = Math.max(latestId, data.latest_id);
+                more = data.has_more;
+            }
+        } catch (err) {
+            console.error("Error polling membership logs:", err);
+        }
+    };
+
+    // This script is loaded on every admin page; only the statistics page has the feed
+    if (logList) {
+        logList.innerHTML = "";
+        await loadOlderLogs();
+        logList.addEventListener("scroll", () => {
+            if (nextCursor && logList.scrollTop + logList.clientHeight >= logList.scrollHeight - 40) {
+                loadOlderLogs();
             }
         });
-    } catch (err) { 
-        console.error("Error fetching membership logs:", err); 
+        adminEvents.on("log", addNewLog);
+        adminEvents.on("ready", pollNewLogs);    // anything logged before the stream opened
+        adminEvents.on("refresh", pollNewLogs);  // bulk changes are not sent one by one
+        setInterval(() => { if (!adminEvents.live) pollNewLogs(); }, LOG_POLL_MS);
+        document.addEventListener("visibilitychange", () => { if (!adminEvents.live) pollNewLogs(); });
     }
 
     // ================== STATISTICS SUMMARY ==================
@@ -40,10 +121,8 @@ document.addEventListener("DOMContentLoaded", async () => {
     const activeEl = document.querySelector(".statistics-summary .summary-card:nth-child(2) p");
     const mostActiveEl = document.querySelector(".statistics-summary .summary-card:nth-child(3) p");
 
-    // Show placeholders
-    [totalEl, activeEl, mostActiveEl].forEach(el => el.textContent = "—");
-
     let statisticsChart;
+    let summary = null;
 
     const initStatisticsCharts = (data) => {
         // Update summary cards
@@ -60,12 +139,29 @@ document.addEventListener("DOMContentLoaded", async () => {
         
     };
 
-    // Fetch statistics summary for this page
-    try {
+    const loadSummary = async () => {
         const res = await fetch("/admin/statistics-summary");
         const data = await res.json();
+        summary = data.summary;
         initStatisticsCharts(data);
-    } catch (err) {
-        console.error("Error fetching statistics summary:", err);
+    };
+
+    const applySummary = (member, sign) => {
+        if (!member) return;
+        summary.total += sign;
+        if (member.status === "Active") summary.active += sign;
+    };
+
+    if (totalEl) {
+        // Show placeholders
+        [totalEl, activeEl, mostActiveEl].forEach(el => el.textContent = "—");
+
+        // Fetch statistics summary for this page, then follow live deltas
+        adminEvents.liveSnapshot(loadSummary, ({ before, after }) => {
+            applySummary(before, -1);
+            applySummary(after, 1);
+            totalEl.textContent = summary.total.toLocaleString();
+            activeEl.textContent = summary.active.toLocaleString();
+        });
     }
 });
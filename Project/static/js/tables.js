@@ -1,108 +1,143 @@
 document.addEventListener("DOMContentLoaded", () => {
+    const tableBody = document.getElementById("memberTableBody");
+    if (!tableBody) return; // Not on the members page
+
     const filterID = document.getElementById("filterID");
     const filterType = document.getElementById("filterType");
     const filterPlan = document.getElementById("filterPlan");
     const filterStatus = document.getElementById("filterStatus");
-    const tableRows = document.querySelectorAll(".registered-member-table tbody tr");
+    const filterSort = document.getElementById("filterSort");
+
+    const rowsPerPage = 10; // Must match MEMBER_PAGE_SIZE for the first server-rendered page
 
-    const rowsPerPage = 10; // Adjust as needed
+    // Keyset pagination: pageCursors[i] is the cursor that fetches page i + 1.
+    // The first page is rendered by the server, so we start with its "next" cursor.
+    let pageCursors = [null];
     let currentPage = 1;
-    let filteredRows = Array.from(tableRows);
+    let nextCursor = tableBody.dataset.nextCursor || null;
+    let debounceTimer;
+
+    const escapeHtml = (value) => String(value ?? "").replace(/[&<>"']/g, ch => ({
+        "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"
+    }[ch]));
+
+    function buildQuery(cursor) {
+        const params = new URLSearchParams({ limit: rowsPerPage, sort: filterSort.value });
+        if (filterID.value.trim()) params.set("id", filterID.value.trim());
+        if (filterType.value) params.set("type", filterType.value);
+        if (filterPlan.value) params.set("plan", filterPlan.value);
+        if (filterStatus.value) params.set("status", filterStatus.value);
+        if (cursor) params.set("cursor", cursor);
+        return params.toString();
+    }
 
-    function applyFilters() {
-        const idValue = filterID.value.toLowerCase();
-        const typeValue = filterType.value;
-        const planValue = filterPlan.value;
-        const statusValue = filterStatus.value;
-
-        filteredRows = Array.from(tableRows).filter(row => {
-            const id = row.cells[0].textContent.toLowerCase();
-            const type = row.cells[2].textContent;
-            const plan = row.cells[3].textContent;
-            const status = row.cells[4].textContent;
-
-            const matchID = id.includes(idValue);
-            const matchType = !typeValue || type === typeValue;
-            const matchPlan = !planValue || plan === planValue;
-            const matchStatus = !statusValue || status === statusValue;
-
-            return matchID && matchType && matchPlan && matchStatus;
-        });
-
-        currentPage = 1; // reset to first page when filtering
-        updatePagination();
+    function renderRows(members) {
+        if (!members.length) {
+            tableBody.innerHTML = `<tr><td colspan="6" style="text-align:center; color:#888;">No members found</td></tr>`;
+            return;
+        }
+
+        tableBody.innerHTML = members.map(member => `
+            <tr>
+                <td>${escapeHtml(member.unique_code)}</td>
+                <td>${escapeHtml(member.first_name)} ${escapeHtml(member.last_name)}</td>
+                <td>${escapeHtml(member.member_type)}</td>
+                <td>${escapeHtml(member.gym_plan)}</td>
+                <td class="${member.status === "Active" ? "active-status" : "inactive-status"}">
+                    ${escapeHtml(member.status)}
+                </td>
+                <td class="table-actions">
+                    <button class="table-btn view" data-id="${member.member_id}">
+                        <i class="fas fa-eye"></i>
+                    </button>
+                    <button class="table-btn edit" data-id="${member.member_id}">
+                        <i class="fas fa-pen"></i>
+                    </button>
+                    <button class="table-btn delete" data-id="${member.member_id}">
+                        <i class="fas fa-trash"></i>
+                    </button>
+                </td>
+            </tr>
+        `).join("");
     }
 
-    // Pagination logic
-    function updatePagination() {
-        const totalPages = Math.ceil(filteredRows.length / rowsPerPage);
-        const tableBody = document.getElementById("memberTableBody");
+    // Fetch one page from the server and swap it in
+    async function loadPage(page) {
+        const cursor = pageCursors[page - 1];
 
         // Add fade-out animation
         tableBody.classList.add("fade-out");
 
-        // Wait for fade-out before updating rows
-        setTimeout(() => {
-            tableRows.forEach(row => (row.style.display = "none"));
+        try {
+            const res = await fetch(`/admin/members-json?${buildQuery(cursor)}`);
+            const data = await res.json();
+            if (!res.ok) throw new Error(data.error || "Failed to load members");
 
-            const start = (currentPage - 1) * rowsPerPage;
-            const end = start + rowsPerPage;
-            filteredRows.slice(start, end).forEach(row => (row.style.display = ""));
+            currentPage = page;
+            nextCursor = data.next_cursor;
+            pageCursors = pageCursors.slice(0, page);
+            if (nextCursor) pageCursors.push(nextCursor);
 
-            renderPageNumbers(totalPages);
+            renderRows(data.members);
+            renderPageNumbers();
+        } catch (err) {
+            console.error("Error loading members:", err);
+        }
 
-            // Switch to fade-in
-            tableBody.classList.remove("fade-out");
-            tableBody.classList.add("fade-in");
+        // Switch to fade-in
+        tableBody.classList.remove("fade-out");
+        tableBody.classList.add("fade-in");
 
-            // Remove fade-in after animation completes
-            setTimeout(() => {
-                tableBody.classList.remove("fade-in");
-            }, 300);
-        }, 200);
+        // Remove fade-in after animation completes
+        setTimeout(() => {
+            tableBody.classList.remove("fade-in");
+        }, 300);
     }
 
-    function renderPageNumbers(totalPages) {
+    // Only pages we have a cursor for can be jumped to directly
+    function renderPageNumbers() {
         const pageNumbersDiv = document.getElementById("pageNumbers");
         pageNumbersDiv.innerHTML = "";
 
-        for (let i = 1; i <= totalPages; i++) {
+        for (let i = 1; i <= pageCursors.length; i++) {
             const btn = document.createElement("button");
             btn.textContent = i;
             btn.classList.add("page-number");
             if (i === currentPage) btn.classList.add("active");
-            btn.addEventListener("click", () => {
-                currentPage = i;
-                updatePagination();
-            });
+            btn.addEventListener("click", () => loadPage(i));
             pageNumbersDiv.appendChild(btn);
         }
 
         document.getElementById("prevPage").disabled = currentPage === 1;
-        document.getElementById("nextPage").disabled = currentPage === totalPages || totalPages === 0;
+        document.getElementById("nextPage").disabled = !nextCursor;
+    }
+
+    function applyFilters() {
+        clearTimeout(debounceTimer);
+        debounceTimer = setTimeout(() => {
+            pageCursors = [null]; // reset to first page when filtering
+            loadPage(1);
+        }, 250);
     }
 
     // Button listeners
     document.getElementById("prevPage").addEventListener("click", () => {
-        if (currentPage > 1) {
-            currentPage--;
-            updatePagination();
-        }
+        if (currentPage > 1) loadPage(currentPage - 1);
     });
 
     document.getElementById("nextPage").addEventListener("click", () => {
-        const totalPages = Math.ceil(filteredRows.length / rowsPerPage);
-        if (currentPage < totalPages) {
-            currentPage++;
-            updatePagination();
-        }
+        if (nextCursor) loadPage(currentPage + 1);
     });
 
-    // Initial load
-    [filterID, filterType, filterPlan, filterStatus].forEach(input => {
-        input.addEventListener("input", applyFilters); 
+    [filterID, filterType, filterPlan, filterStatus, filterSort].forEach(input => {
+        input.addEventListener("input", applyFilters);
         input.addEventListener("change", applyFilters);
     });
 
-    applyFilters(); // initialize first render
+    // Let members.js reload the visible page after add/edit/delete
+    window.reloadMemberTable = () => loadPage(currentPage);
+
+    // Initial load: first page already rendered by the server
+    if (nextCursor) pageCursors.push(nextCursor);
+    renderPageNumbers();
 });
@@ -0,0 +1,52 @@
+// ========================================
+// USER DASHBOARD - refresh figures in place
+// ========================================
+document.addEventListener("DOMContentLoaded", () => {
+    const recentBody = document.getElementById("recentWorkoutsBody");
+    const recentTable = document.getElementById("recentWorkoutsTable");
+    const recentEmpty = document.getElementById("recentWorkoutsEmpty");
+    if (!document.querySelector("[data-summary]")) return;
+
+    const REFRESH_MS = 60000;
+
+    function escapeHtml(value) {
+        const div = document.createElement("div");
+        div.textContent = value == null ? "" : String(value);
+        return div.innerHTML;
+    }
+
+    function render(summary) {
+        document.querySelectorAll("[data-summary]").forEach(el => {
+            const value = summary[el.dataset.summary];
+            if (value !== undefined) el.textContent = value;
+        });
+
+        if (recentBody) {
+            recentBody.innerHTML = summary.recent_workouts.map(w => `
+                <tr>
+                    <td>${escapeHtml(w.workout_date_display)}</td>
+                    <td><span class="exercise-badge">${escapeHtml(w.exercise_type)}</span></td>
+                    <td>${escapeHtml(w.duration_minutes)} min</td>
+                    <td>${escapeHtml(w.calories_burned || "-")}</td>
+                </tr>`).join("");
+        }
+        const hasWorkouts = summary.recent_workouts.length > 0;
+        if (recentTable) recentTable.hidden = !hasWorkouts;
+        if (recentEmpty) recentEmpty.hidden = hasWorkouts;
+    }
+
+    async function refresh() {
+        if (document.hidden) return;
+        try {
+            const res = await fetch("/user/dashboard/summary", { headers: { "Accept": "application/json" } });
+            if (!res.ok) return;
+            const data = await res.json();
+            if (data.success) render(data.summary);
+        } catch (err) {
+            console.error("Dashboard refresh failed:", err);
+        }
+    }
+
+    setInterval(refresh, REFRESH_MS);
+    document.addEventListener("visibilitychange", refresh);
+});
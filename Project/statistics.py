@@ -1,140 +1,244 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func, case
 from . import db
-from .models import Member, MembershipLog
+from .models import Member, MembershipLog, DailyRollup
+from .cache import cache
+from .versioning import conditional_on_data, versioned_cache_key
+from .dbfuncs import month_bucket
+from .addMember import query_members_page
+from .pagination import encode_cursor, decode_cursor, coerce_cursor_value, keyset_filter
 from datetime import datetime, timedelta
 import pytz
 
 statistics = Blueprint('statistics', __name__)
 
+# Allowed overview window lengths, in months
+SUMMARY_WINDOWS = (6, 12, 24)
+
+# Membership log feed paging
+LOG_PAGE_SIZE = 50
+LOG_PAGE_MAX = 200
+LOG_DEFAULT_DAYS = 7
+LOG_MAX_DAYS = 90
+
 @statistics.route('/admin/members-statistics', methods=['GET'])
 def get_members_statistics():
+    cached = cache.get('admin:members_statistics')
+    if cached is not None:
+        return jsonify(cached)
+
     tz = pytz.timezone('Asia/Manila')
-    now = datetime.now(tz)
-    start_of_day = tz.localize(datetime(now.year, now.month, now.day))
-    start_of_month = tz.localize(datetime(now.year, now.month, 1))
-
-    members = Member.query.all()
-    total_revenue = daily_revenue = monthly_revenue = 0
-    total_members = len(members)
-    active_members = 0
-
-    member_list = []
-
-    for m in members:
-        price = float(m.price_paid or 0)
-        created_at = m.date_registered
-
-        # Make datetime timezone-aware if it's naive
-        if created_at.tzinfo is None:
-            created_at = tz.localize(created_at)
-
-        total_revenue += price
-        if created_at >= start_of_month:
-            monthly_revenue += price
-        if created_at >= start_of_day:
-            daily_revenue += price
-
-        if m.status.lower() == "active":
-            active_members += 1
-
-        member_list.append({
-            "id": m.member_id,
-            "unique_code": m.unique_code,
-            "first_name": m.first_name,
-            "last_name": m.last_name,
-            "price_paid": m.price_paid,
-            "member_type": m.member_type,
-            "gym_plan": m.gym_plan,
-            "status": m.status,
-            "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
+    today = datetime.now(tz).date()
+    start_of_month = today.replace(day=1)
 
-    return jsonify({
-        "members": member_list,
+    # Revenue from the daily rollup: a few rows per day instead of every member
+    revenue = DailyRollup.revenue
+    total_revenue, monthly_revenue, daily_revenue = db.session.query(
+        func.coalesce(func.sum(revenue), 0),
+        func.coalesce(func.sum(case((DailyRollup.local_date >= start_of_month, revenue), else_=0)), 0),
+        func.coalesce(func.sum(case((DailyRollup.local_date == today, revenue), else_=0)), 0)
+    ).one()
+
+    # Counts: one status GROUP BY over the indexed status column
+    status_counts = dict(
+        db.session.query(Member.status, func.count(Member.member_id))
+        .group_by(Member.status)
+        .all()
+    )
+    total_members = sum(status_counts.values())
+    active_members = status_counts.get("Active", 0)
+
+    result = {
         "stats": {
-            "total_revenue": total_revenue,
-            "monthly_revenue": monthly_revenue,
-            "daily_revenue": daily_revenue,
+            "total_revenue": float(total_revenue),
+            "monthly_revenue": float(monthly_revenue),
+            "daily_revenue": float(daily_revenue),
             "total_members": total_members,
-            "active_members": active_members
+            "active_members": int(active_members)
         }
+    }
+    cache.set('admin:members_statistics', result)
+
+    return jsonify(result)
+
+# Paginated member list that used to ship inside /admin/members-statistics
+@statistics.route('/admin/members-statistics/members', methods=['GET'])
+def get_members_statistics_list():
+    try:
+        members, next_cursor = query_members_page(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({
+        "members": [
+            {
+                "id": m.member_id,
+                "unique_code": m.unique_code,
+                "first_name": m.first_name,
+                "last_name": m.last_name,
+                "price_paid": m.price_paid,
+                "member_type": m.member_type,
+                "gym_plan": m.gym_plan,
+                "status": m.status,
+                "created_at": m.date_registered.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            for m in members
+        ],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
     })
 
-@statistics.route('/admin/membership-logs', methods=['GET'])
-def get_membership_logs():
-    tz = pytz.timezone('Asia/Manila')
-    now = datetime.now(tz)
-    one_week_ago = now - timedelta(days=7)
+# ========================================
+# MEMBERSHIP LOG FEED
+# ========================================
+def membership_log_feed_query(window_start, cursor_values=None, since_id=None):
+    """Log rows with their member's name, newest first, read off ix_membership_logs_action_date.
 
-    logs = (
-        db.session.query(MembershipLog, Member)
+    cursor_values continues after an (action_date, log_id) pair; since_id instead
+    returns only logs added after that id, oldest first, for polling.
+    """
+    query = (
+        db.session.query(
+            MembershipLog.log_id, MembershipLog.member_id, MembershipLog.action_type,
+            MembershipLog.action_date, MembershipLog.remarks, Member.first_name, Member.last_name
+        )
         .join(Member, MembershipLog.member_id == Member.member_id)
-        .filter(MembershipLog.action_date >= one_week_ago)
-        .order_by(MembershipLog.action_date.desc())
-        .all()
+        .filter(MembershipLog.action_date >= window_start)
     )
+    if since_id is not None:
+        return query.filter(MembershipLog.log_id > since_id).order_by(MembershipLog.log_id.asc())
+
+    columns = [MembershipLog.action_date, MembershipLog.log_id]
+    if cursor_values:
+        query = query.filter(keyset_filter(columns, cursor_values, descending=True))
+    return query.order_by(MembershipLog.action_date.desc(), MembershipLog.log_id.desc())
 
-    result = []
-    for log, member in logs:
+
+def read_log_feed_args(args):
+    """Validate days, limit, cursor and since_id. Raises ValueError on bad input."""
+    try:
+        days = int(args.get('days') or LOG_DEFAULT_DAYS)
+        limit = int(args.get('limit') or LOG_PAGE_SIZE)
+        since_id = int(args['since_id']) if args.get('since_id') else None
+    except ValueError:
+        raise ValueError("days, limit and since_id must be numbers.")
+    if not 1 <= days <= LOG_MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {LOG_MAX_DAYS}.")
+    limit = max(1, min(limit, LOG_PAGE_MAX))
+
+    cursor_values = None
+    if args.get('cursor'):
+        if since_id is not None:
+            raise ValueError("Use either cursor or since_id, not both.")
+        values = decode_cursor(args['cursor'])
         try:
-            action_type = str(log.action_type)
-        except LookupError:
-            action_type = "Unknown"
-
-        result.append({
-            "log_id": log.log_id,
-            "member_id": member.member_id,
-            "member_name": f"{member.first_name} {member.last_name}",
-            "action_type": action_type,
-            "action_date": log.action_date.strftime("%Y-%m-%d %H:%M:%S"),
-            "remarks": log.remarks or ""
-        })
+            action_date, log_id = values
+            cursor_values = [coerce_cursor_value(MembershipLog.action_date, action_date),
+                             coerce_cursor_value(MembershipLog.log_id, log_id)]
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor.")
+
+    return days, limit, cursor_values, since_id
+
+
+def serialize_log_row(row):
+    return {
+        "log_id": row.log_id,
+        "member_id": row.member_id,
+        "member_name": f"{row.first_name} {row.last_name}",
+        "action_type": row.action_type,
+        "action_date": row.action_date.strftime("%Y-%m-%d %H:%M:%S"),
+        "remarks": row.remarks or ""
+    }
 
-    return jsonify(result)
+
+@statistics.route('/admin/membership-logs', methods=['GET'])
+def get_membership_logs():
+    """Activity feed for the past `days` (default 7).
+
+    Pages newest first: pass next_cursor back as `cursor` for older entries. To poll,
+    pass the last latest_id as `since_id`; new logs come back oldest first, and
+    has_more means another poll with the new latest_id is needed.
+    """
+    try:
+        days, limit, cursor_values, since_id = read_log_feed_args(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    tz = pytz.timezone('Asia/Manila')
+    window_start = datetime.now(tz).replace(tzinfo=None) - timedelta(days=days)
+
+    if since_id is None:
+        # Highest id so far (a primary-key lookup), so polling starts right after this page.
+        # Read before the page: a log committed in between is then polled again (the client
+        # skips ones it already shows) instead of being missed.
+        latest_id = db.session.query(func.max(MembershipLog.log_id)).scalar() or 0
+
+    rows = membership_log_feed_query(window_start, cursor_values, since_id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if since_id is not None:
+        latest_id = rows[-1].log_id if rows else since_id
+    elif has_more:
+        next_cursor = encode_cursor([rows[-1].action_date, rows[-1].log_id])
+
+    return jsonify({
+        "logs": [serialize_log_row(row) for row in rows],
+        "next_cursor": next_cursor,
+        "latest_id": latest_id,
+        "has_more": has_more
+    })
 
 @statistics.route("/admin/statistics-summary", methods=["GET"])
+@conditional_on_data
 def statistics_summary():
+    months = request.args.get("months", 6, type=int)
+    if months not in SUMMARY_WINDOWS:
+        return jsonify({"success": False, "error": "months must be one of 6, 12 or 24."}), 400
+
+    cache_key = versioned_cache_key(f"admin:statistics_summary:{months}")
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
+
     tz = pytz.timezone("Asia/Manila")
     now = datetime.now(tz)
 
+    # Month labels for the window, oldest first (e.g. 2025-05 ... 2025-10)
     labels = []
-    students_data = []
-    faculty_data = []
-    outsiders_data = []
-
-    # Collect last 6 months
-    for i in range(5, -1, -1):  # 5 -> 0 months ago
-        month = (now.month - i - 1) % 12 + 1
-        year = now.year if now.month - i > 0 else now.year - 1
-        labels.append(f"{year}-{month:02d}")
-
-        # Count members per type for that month
-        start = tz.localize(datetime(year, month, 1))
-        if month == 12:
-            end = tz.localize(datetime(year + 1, 1, 1))
-        else:
-            end = tz.localize(datetime(year, month + 1, 1))
-
-        students_count = Member.query.filter(Member.date_registered >= start,
-                                            Member.date_registered < end,
-                                            Member.member_type == "Student").count()
-        faculty_count = Member.query.filter(Member.date_registered >= start,
-                                            Member.date_registered < end,
-                                            Member.member_type == "Faculty").count()
-        outsiders_count = Member.query.filter(Member.date_registered >= start,
-                                            Member.date_registered < end,
-                                            Member.member_type == "Outsider").count()
-
-        students_data.append(students_count)
-        faculty_data.append(faculty_count)
-        outsiders_data.append(outsiders_count)
+    for i in range(months - 1, -1, -1):  # N-1 -> 0 months ago
+        year, month = divmod(now.year * 12 + now.month - 1 - i, 12)
+        labels.append(f"{year}-{month + 1:02d}")
+
+    window_start = datetime.strptime(labels[0], "%Y-%m").date()
+
+    # One grouped query over the daily rollup: registrations per (Manila month, member type)
+    bucket = month_bucket(DailyRollup.local_date)
+    rows = (
+        db.session.query(bucket, DailyRollup.member_type, func.sum(DailyRollup.registrations))
+        .filter(DailyRollup.local_date >= window_start)
+        .group_by(bucket, DailyRollup.member_type)
+        .all()
+    )
+    counts = {(label, member_type): count for label, member_type, count in rows}
+
+    students_data = [counts.get((label, "Student"), 0) for label in labels]
+    faculty_data = [counts.get((label, "Faculty"), 0) for label in labels]
+    outsiders_data = [counts.get((label, "Outsider"), 0) for label in labels]
 
     # Summary cards
-    total_members = Member.query.count()
-    active_members = Member.query.filter_by(status="Active").count()
+    status_counts = dict(
+        db.session.query(Member.status, func.count(Member.member_id))
+        .group_by(Member.status)
+        .all()
+    )
+    total_members = sum(status_counts.values())
+    active_members = status_counts.get("Active", 0)
     most_active = "Students"  # Example, or compute based on activity logs
 
-    return jsonify({
+    result = {
         "summary": {
             "total": total_members,
             "active": active_members,
@@ -146,4 +250,7 @@ def statistics_summary():
             "faculty": faculty_data,
             "outsiders": outsiders_data
         }
-    })
+    }
+    cache.set(cache_key, result)
+
+    return jsonify(result)
@@ -1,6 +1,9 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for, flash
-from . import db
+from . import db, rollups
 from .models import Member, MembershipLog, GymPricing
+from .cache import invalidate_member_data, invalidate_user_data
+from .passwords import passwords, HasherBusyError
+from .events import publish_member_change, publish_log, member_snapshot
 from datetime import datetime, timedelta
 import pytz
 import re
@@ -105,6 +108,13 @@ def user_register():
         start_date = datetime.now(tz).date()
         end_date = calculate_end_date(start_date, gym_plan)
 
+        # Hash before touching the database so the slow part never holds the write lock
+        try:
+            password_hash = passwords.hash(password)
+        except HasherBusyError:
+            flash('Too many sign-ups right now. Please try again in a moment.', 'warning')
+            return render_template('user_register.html'), 503
+
         new_member = Member(
             first_name=first_name,
             last_name=last_name,
@@ -119,19 +129,17 @@ def user_register():
             start_date=start_date,
             end_date=end_date,
             status='Active',
-            is_self_registered=True
+            is_self_registered=True,
+            password_hash=password_hash
         )
 
-        # Set password
-        new_member.set_password(password)
-
         # Set price
         new_member.set_registration_price()
 
         # Save to database
         try:
             db.session.add(new_member)
-            db.session.commit()
+            db.session.flush()  # assigns member_id and date_registered
 
             # Create membership log
             log = MembershipLog(
@@ -140,7 +148,11 @@ def user_register():
                 remarks=f'User self-registered with {gym_plan} plan'
             )
             db.session.add(log)
+            rollups.record_registration(new_member)
+            publish_member_change(None, member_snapshot(new_member))
+            publish_log(log, new_member)
             db.session.commit()
+            invalidate_member_data()
 
             flash(f'Registration successful! Your Member ID is {new_member.unique_code}. Please login.', 'success')
             return redirect(url_for('userAuth.user_login'))
@@ -185,14 +197,20 @@ def user_login():
             return redirect(url_for('userAuth.activate_account'))
 
         # Verify password
-        if not member.check_password(password):
-            flash('Invalid email or password.', 'error')
-            return render_template('user_login.html')
+        try:
+            if not member.check_password(password):
+                flash('Invalid email or password.', 'error')
+                return render_template('user_login.html')
 
-        # Check membership status
-        member.check_and_update_status()
+            # Upgrade the stored hash if PASSWORD_HASH_METHOD changed since it was made
+            if member.rehash_password_if_needed(password):
+                db.session.commit()
+        except HasherBusyError:
+            flash('Too many sign-ins right now. Please try again in a moment.', 'warning')
+            return render_template('user_login.html'), 503
 
-        if member.status == 'Expired':
+        # Derived from end_date; the maintenance sweep persists the change
+        if member.effective_status == 'Expired':
             flash('Your membership has expired. Please renew to continue.', 'warning')
             # Still allow login to see expired status
 
@@ -295,22 +313,30 @@ def activate_account():
                 flash('This account is already activated. Please login instead.', 'warning')
                 return redirect(url_for('userAuth.user_login'))
 
-            # Set password
-            member.set_password(password)
-
             # Create activation log
             try:
+                # Set password
+                member.set_password(password)
+
                 log = MembershipLog(
                     member_id=member.member_id,
                     action_type='Account Activated',
                     remarks=f'User activated admin-created account'
                 )
                 db.session.add(log)
+                publish_log(log, member)
                 db.session.commit()
+                invalidate_member_data()
+                invalidate_user_data(member.member_id)
 
                 flash(f'Account activated successfully! You can now login with your email and password.', 'success')
                 return redirect(url_for('userAuth.user_login'))
 
+            except HasherBusyError:
+                db.session.rollback()
+                flash('Too many sign-ins right now. Please try again in a moment.', 'warning')
+                return redirect(url_for('userAuth.activate_account'))
+
             except Exception as e:
                 db.session.rollback()
                 flash('Activation failed. Please try again.', 'error')
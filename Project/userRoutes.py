@@ -1,8 +1,10 @@
-from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify, current_app
 from functools import wraps
 from . import db
-from .models import Member, Workout
-from datetime import datetime, timedelta
+from .models import Member, Workout, WorkoutStats
+from .cache import cache, user_cache_key, invalidate_user_data
+from datetime import datetime, date
+from sqlalchemy import select
 import pytz
 
 userRoutes = Blueprint('userRoutes', __name__)
@@ -20,77 +22,129 @@ def user_login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# ========================================
+# DASHBOARD SUMMARY
+# ========================================
+DASHBOARD_RECENT_WORKOUTS = 5
+
+
+def dashboard_summary_query(member_id):
+    """Member, workout stats and recent workouts in one statement (one row per recent workout)."""
+    recent = (
+        select(Workout.member_id, Workout.workout_id, Workout.workout_date, Workout.exercise_type,
+               Workout.duration_minutes, Workout.calories_burned)
+        .where(Workout.member_id == member_id)
+        .order_by(Workout.workout_date.desc(), Workout.workout_id.desc())
+        .limit(DASHBOARD_RECENT_WORKOUTS)
+        .subquery()
+    )
+    return (
+        select(Member.member_id, Member.unique_code, Member.first_name, Member.last_name,
+               Member.member_type, Member.gym_plan, Member.status, Member.start_date, Member.end_date,
+               WorkoutStats.total_workouts, WorkoutStats.total_minutes,
+               WorkoutStats.current_streak, WorkoutStats.last_workout_date,
+               recent.c.workout_id, recent.c.workout_date, recent.c.exercise_type,
+               recent.c.duration_minutes, recent.c.calories_burned)
+        .outerjoin(WorkoutStats, WorkoutStats.member_id == Member.member_id)
+        .outerjoin(recent, recent.c.member_id == Member.member_id)
+        .where(Member.member_id == member_id)
+        .order_by(recent.c.workout_date.desc(), recent.c.workout_id.desc())
+    )
+
+
+def load_dashboard_summary(member_id):
+    """Everything the dashboard shows, as JSON-ready data. None if the member is gone."""
+    rows = db.session.execute(dashboard_summary_query(member_id)).all()
+    if not rows:
+        return None
+
+    first = rows[0]
+    return {
+        "member": {
+            "member_id": first.member_id,
+            "unique_code": first.unique_code,
+            "first_name": first.first_name,
+            "last_name": first.last_name,
+            "member_type": first.member_type,
+            "gym_plan": first.gym_plan,
+            "status": first.status,
+            "start_date": first.start_date.isoformat(),
+            "end_date": first.end_date.isoformat(),
+            "end_date_display": first.end_date.strftime('%b %d, %Y'),
+        },
+        "total_workouts": first.total_workouts or 0,
+        "total_hours": round((first.total_minutes or 0) / 60, 1),
+        "current_streak": first.current_streak or 0,
+        "last_workout_date": first.last_workout_date.isoformat() if first.last_workout_date else None,
+        "recent_workouts": [
+            {
+                "workout_id": row.workout_id,
+                "workout_date": row.workout_date.isoformat(),
+                "workout_date_display": row.workout_date.strftime('%b %d, %Y %I:%M %p'),
+                "exercise_type": row.exercise_type,
+                "duration_minutes": row.duration_minutes,
+                "calories_burned": row.calories_burned,
+            }
+            for row in rows if row.workout_id is not None
+        ],
+    }
+
+
+def get_dashboard_summary(member_id):
+    """Cached dashboard figures for one member, plus the figures that depend on today's date."""
+    key = user_cache_key(member_id, 'dashboard')
+    summary = cache.get(key)
+    if summary is None:
+        summary = load_dashboard_summary(member_id)
+        if summary is None:
+            return None
+        cache.set(key, summary, current_app.config.get('USER_DASHBOARD_TTL', 30))
+
+    # Derived per request so a cached entry never goes stale at midnight
+    today = datetime.now(pytz.timezone('Asia/Manila')).date()
+    end_date = date.fromisoformat(summary['member']['end_date'])
+    member = dict(summary['member'], status=Member.derive_status(summary['member']['status'], end_date, today))
+    return dict(
+        summary,
+        member=member,
+        days_remaining=(end_date - today).days if end_date > today else 0,
+        # The stored streak only counts today if the member worked out today
+        streak=summary['current_streak'] if summary['last_workout_date'] == today.isoformat() else 0,
+    )
+
+
 # ========================================
 # USER DASHBOARD
 # ========================================
 @userRoutes.route('/user/dashboard')
 @user_login_required
 def dashboard():
-    user_id = session.get('user_id')
-    member = Member.query.get(user_id)
+    summary = get_dashboard_summary(session.get('user_id'))
 
-    if not member:
+    if not summary:
         flash('User not found. Please login again.', 'error')
         session.clear()
         return redirect(url_for('userAuth.user_login'))
 
-    # Update status if needed
-    member.check_and_update_status()
-
-    # Calculate days remaining
-    tz = pytz.timezone('Asia/Manila')
-    today = datetime.now(tz).date()
-    days_remaining = (member.end_date - today).days if member.end_date > today else 0
-
-    # Get workout statistics
-    total_workouts = Workout.query.filter_by(member_id=user_id).count()
-    total_minutes = db.session.query(db.func.sum(Workout.duration_minutes)).filter_by(member_id=user_id).scalar() or 0
-    total_hours = round(total_minutes / 60, 1)
-
-    # Calculate streak (consecutive days with workouts)
-    streak = calculate_workout_streak(user_id)
-
-    # Get recent workouts (last 5)
-    recent_workouts = Workout.query.filter_by(member_id=user_id).order_by(Workout.workout_date.desc()).limit(5).all()
-
     return render_template('user_dashboard.html',
-                         member=member,
-                         days_remaining=days_remaining,
-                         total_workouts=total_workouts,
-                         total_hours=total_hours,
-                         streak=streak,
-                         recent_workouts=recent_workouts)
+                         member=summary['member'],
+                         days_remaining=summary['days_remaining'],
+                         total_workouts=summary['total_workouts'],
+                         total_hours=summary['total_hours'],
+                         streak=summary['streak'],
+                         recent_workouts=summary['recent_workouts'])
 
-# ========================================
-# HELPER: Calculate Workout Streak
-# ========================================
-def calculate_workout_streak(member_id):
-    """Calculate consecutive days with at least one workout."""
-    tz = pytz.timezone('Asia/Manila')
-    today = datetime.now(tz).date()
-
-    workouts = Workout.query.filter_by(member_id=member_id).order_by(Workout.workout_date.desc()).all()
-
-    if not workouts:
-        return 0
 
-    # Get unique workout dates
-    workout_dates = set()
-    for workout in workouts:
-        workout_date = workout.workout_date
-        if workout_date.tzinfo is None:
-            workout_date = tz.localize(workout_date)
-        workout_dates.add(workout_date.date())
+@userRoutes.route('/user/dashboard/summary')
+def dashboard_summary():
+    """JSON variant of the dashboard, used to refresh the page in place."""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Please log in to view your dashboard."}), 401
 
-    # Calculate streak
-    streak = 0
-    current_date = today
-
-    while current_date in workout_dates:
-        streak += 1
-        current_date -= timedelta(days=1)
-
-    return streak
+    summary = get_dashboard_summary(session['user_id'])
+    if not summary:
+        return jsonify({"success": False, "error": "User not found."}), 404
+    return jsonify({"success": True, "summary": summary}), 200
 
 # ========================================
 # USER PROFILE (View)
@@ -132,6 +186,7 @@ def update_profile():
 
     try:
         db.session.commit()
+        invalidate_user_data(user_id)
         flash('Profile updated successfully!', 'success')
     except Exception as e:
         db.session.rollback()
@@ -154,9 +209,6 @@ def membership():
         session.clear()
         return redirect(url_for('userAuth.user_login'))
 
-    # Update status
-    member.check_and_update_status()
-
     # Calculate days remaining
     tz = pytz.timezone('Asia/Manila')
     today = datetime.now(tz).date()
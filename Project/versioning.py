@@ -0,0 +1,142 @@
+from flask import request, g, make_response
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from . import db
+from .models import DataVersion, Member, MembershipLog, GymPricing, DailyRollup
+from .dbfuncs import upsert_insert
+from datetime import datetime
+from functools import wraps
+import pytz
+
+
+# Everything the admin JSON endpoints read: members, their logs, prices and the rollups built from them
+ADMIN_DATA = 'admin'
+ADMIN_DATA_MODELS = (Member, MembershipLog, GymPricing, DailyRollup)
+ADMIN_DATA_TABLES = frozenset(model.__tablename__ for model in ADMIN_DATA_MODELS)
+
+
+def _manila_now():
+    return datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+
+
+# ========================================
+# VERSION COUNTER
+# ========================================
+def current_version(name=ADMIN_DATA):
+    """(version, updated_at) of a data group: one primary-key read. (0, None) before the first write."""
+    row = db.session.execute(
+        select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == name)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def bump_version(session, name=ADMIN_DATA):
+    """Advance a data group's version inside the session's current transaction."""
+    table = DataVersion.__table__
+    now = _manila_now()
+
+    upsert = upsert_insert(table)
+    if upsert is not None:
+        upsert = upsert.values(name=name, version=1, updated_at=now)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'version': table.c.version + 1, 'updated_at': now}
+        )
+        session.execute(upsert)
+        return
+
+    # Other databases: update, then insert if the row didn't exist yet
+    result = session.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        session.execute(table.insert().values(name=name, version=1, updated_at=now))
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_admin_data_writes(session, flush_context):
+    if any(isinstance(obj, ADMIN_DATA_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['admin_data_changed'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_admin_data_writes(orm_execute_state):
+    # update(Member), insert(MembershipLog) and Core statements on the tables skip the flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if not (any(mapper.class_ in ADMIN_DATA_MODELS for mapper in orm_execute_state.all_mappers)
+            or getattr(table, 'name', None) in ADMIN_DATA_TABLES):
+        return
+
+    # The scheduler's sweeps usually match nothing; only a statement that touched rows counts
+    result = orm_execute_state.invoke_statement()
+    if getattr(result, 'rowcount', -1) != 0:
+        orm_execute_state.session.info['admin_data_changed'] = True
+    return result
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_admin_data_version(session):
+    session.flush()  # the commit's own flush comes after this hook; pending writes must be seen now
+    if session.info.pop('admin_data_changed', False):
+        bump_version(session)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_admin_data_writes(session, previous_transaction):
+    session.info.pop('admin_data_changed', None)
+
+
+# ========================================
+# CONDITIONAL GET
+# ========================================
+def versioned_cache_key(key):
+    """Scope a cache key to the data version the request was validated against.
+
+    An entry built before a write in another worker is never served under the newer ETag.
+    """
+    version = g.get('data_version')
+    return key if version is None else f"{key}@{version}"
+
+
+def conditional_on_data(view):
+    """ETag / Last-Modified for a JSON view that only reads admin data.
+
+    The version is read before the view runs, so a matching If-None-Match (or
+    If-Modified-Since) gets a 304 without the view's queries. The Manila date is
+    part of the tag because the month windows and "today" move even without writes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version, updated_at = current_version()
+        today = _manila_now().date()
+        etag = f"{version}-{today:%Y%m%d}"
+
+        # Changes are only visible from the later of the last write and today's midnight
+        manila = pytz.timezone('Asia/Manila')
+        last_modified = manila.localize(datetime.combine(today, datetime.min.time()))
+        if updated_at is not None:
+            last_modified = max(last_modified, manila.localize(updated_at.replace(microsecond=0)))
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and last_modified <= since
+
+        if not_modified:
+            response = make_response('', 304)
+        else:
+            g.data_version = version
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        # Browsers keep the copy but revalidate on every fetch
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    return wrapper
@@ -0,0 +1,401 @@
+from flask import Blueprint, request, jsonify, session, current_app
+from . import db
+from .models import Member, Workout, WorkoutStats
+from .adminAuth import admin_required
+from .cache import invalidate_user_data
+from .dbfuncs import day_bucket, upsert_insert
+from datetime import datetime, timedelta
+from itertools import groupby
+from sqlalchemy import select, exists, bindparam, func, literal
+import pytz
+
+
+workouts = Blueprint('workouts', __name__)
+
+MAX_DURATION_MINUTES = 24 * 60
+
+
+# ========================================
+# VALIDATION
+# ========================================
+def _manila_now():
+    return datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+
+
+def _parse_workout_date(value):
+    """ISO date or datetime -> naive Asia/Manila datetime (how DateTime columns are stored)."""
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+    return parsed
+
+
+def validate_workout(raw, now):
+    """Clean one workout payload. Returns (values, errors); values is None when errors is not empty."""
+    if not isinstance(raw, dict):
+        return None, ["Workout must be an object."]
+
+    errors = []
+    exercise_type = str(raw.get('exercise_type') or '').strip()
+    if not exercise_type:
+        errors.append("exercise_type is required.")
+    elif len(exercise_type) > 50:
+        errors.append("exercise_type must be at most 50 characters.")
+
+    values = {}
+    for field, required in (('duration_minutes', True), ('calories_burned', False)):
+        value = raw.get(field)
+        if value in (None, ''):
+            if required:
+                errors.append(f"{field} is required.")
+            values[field] = None
+            continue
+        try:
+            values[field] = int(value)
+        except (TypeError, ValueError):
+            errors.append(f"{field} must be a whole number.")
+            continue
+        if field == 'duration_minutes' and not 1 <= values[field] <= MAX_DURATION_MINUTES:
+            errors.append(f"duration_minutes must be between 1 and {MAX_DURATION_MINUTES}.")
+        if field == 'calories_burned' and values[field] < 0:
+            errors.append("calories_burned cannot be negative.")
+
+    workout_date = now
+    if raw.get('workout_date'):
+        try:
+            workout_date = _parse_workout_date(raw['workout_date'])
+        except ValueError:
+            errors.append("workout_date must be an ISO date or datetime.")
+        else:
+            if workout_date.date() > now.date():
+                errors.append("workout_date cannot be in the future.")
+
+    idempotency_key = raw.get('idempotency_key')
+    if idempotency_key is not None:
+        idempotency_key = str(idempotency_key).strip() or None
+        if idempotency_key and len(idempotency_key) > 64:
+            errors.append("idempotency_key must be at most 64 characters.")
+
+    if errors:
+        return None, errors
+
+    return {
+        'exercise_type': exercise_type,
+        'duration_minutes': values['duration_minutes'],
+        'calories_burned': values['calories_burned'],
+        'notes': (raw.get('notes') or None),
+        'workout_date': workout_date,
+        'created_at': now,
+        'idempotency_key': idempotency_key,
+    }, []
+
+
+def read_workout_payload():
+    """A single workout object, a list, or {"workouts": [...]}."""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and 'workouts' in data:
+        data = data['workouts']
+    if isinstance(data, dict):
+        return [data]
+    if not isinstance(data, list):
+        raise ValueError("Send a workout object, a list, or {\"workouts\": [...]} as JSON.")
+    return data
+
+
+# ========================================
+# WRITES (inside the caller's transaction)
+# ========================================
+def bump_workout_stats(member_id, workouts=0, minutes=0):
+    """Add to one member's workout totals inside the current transaction."""
+    if not workouts and not minutes:
+        return
+
+    table = WorkoutStats.__table__
+    upsert = upsert_insert(table)
+    if upsert is not None:
+        upsert = upsert.values(
+            member_id=member_id, total_workouts=workouts, total_minutes=minutes
+        )
+        db.session.execute(upsert.on_conflict_do_update(
+            index_elements=['member_id'],
+            set_={
+                'total_workouts': table.c.total_workouts + upsert.excluded.total_workouts,
+                'total_minutes': table.c.total_minutes + upsert.excluded.total_minutes,
+            }
+        ))
+        return
+
+    result = db.session.execute(
+        table.update().where(table.c.member_id == member_id).values(
+            total_workouts=table.c.total_workouts + workouts,
+            total_minutes=table.c.total_minutes + minutes,
+        )
+    )
+    if result.rowcount == 0:
+        db.session.execute(table.insert().values(member_id=member_id, total_workouts=workouts, total_minutes=minutes))
+
+
+def insert_workouts(member_id, rows):
+    """Bulk-insert validated rows for one member, skipping idempotency keys already stored.
+
+    Returns {row index: workout_id} for inserted rows; skipped indexes are duplicates.
+    """
+    # Keys repeated inside the batch: first occurrence wins
+    seen, candidates = set(), []
+    for index, row in enumerate(rows):
+        key = row['idempotency_key']
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        candidates.append((index, row))
+
+    if seen:
+        stored = set(db.session.scalars(
+            select(Workout.idempotency_key)
+            .where(Workout.member_id == member_id, Workout.idempotency_key.in_(seen))
+        ))
+        candidates = [(i, row) for i, row in candidates if row['idempotency_key'] not in stored]
+
+    if not candidates:
+        return {}
+
+    table = Workout.__table__
+    stmt = upsert_insert(table)
+    if stmt is None:
+        stmt = table.insert()
+    else:
+        # A concurrent upload of the same keys may have committed since the check above
+        stmt = stmt.on_conflict_do_nothing(index_elements=['member_id', 'idempotency_key'])
+    returned = db.session.execute(
+        stmt.returning(table.c.workout_id, table.c.idempotency_key, table.c.duration_minutes,
+                       sort_by_parameter_order=True),
+        [dict(row, member_id=member_id) for _, row in candidates]
+    ).all()
+
+    # Match RETURNING rows back to their input rows (rows skipped on conflict are missing)
+    inserted, days, cursor = {}, set(), 0
+    for workout_id, key, minutes in returned:
+        while candidates[cursor][1]['idempotency_key'] != key:
+            cursor += 1
+        index, row = candidates[cursor]
+        inserted[index] = workout_id
+        days.add(row['workout_date'].date())
+        cursor += 1
+
+    bump_workout_stats(member_id, workouts=len(returned), minutes=sum(row[2] for row in returned))
+    update_streak(member_id, days)
+    return inserted
+
+
+def delete_workout(workout):
+    """Delete one workout and take it back out of its member's stats."""
+    member_id, day = workout.member_id, workout.workout_date.date()
+    db.session.delete(workout)
+    db.session.flush()
+
+    bump_workout_stats(member_id, workouts=-1, minutes=-workout.duration_minutes)
+    # Only losing a member's last workout of a day can change their streak
+    same_day = exists().where(Workout.member_id == member_id, day_bucket(Workout.workout_date) == day)
+    if not db.session.query(same_day).scalar():
+        _write_streak(member_id, *recompute_streak(member_id))
+
+
+# ========================================
+# STREAKS
+# ========================================
+def streak_from_days(days):
+    """(streak, last day) for distinct workout days sorted newest first."""
+    streak, last_day, expected = 0, None, None
+    for day in days:
+        if last_day is None:
+            last_day = expected = day
+        if day != expected:
+            break
+        streak += 1
+        expected = day - timedelta(days=1)
+    return streak, last_day
+
+
+def recompute_streak(member_id):
+    """Walk one member's distinct workout days back from the newest until the first gap."""
+    day = day_bucket(Workout.workout_date)
+    days = db.session.scalars(
+        select(day).where(Workout.member_id == member_id).group_by(day).order_by(day.desc())
+    )
+    return streak_from_days(days)
+
+
+def _write_streak(member_id, streak, last_day):
+    table = WorkoutStats.__table__
+    db.session.execute(
+        table.update().where(table.c.member_id == member_id)
+        .values(current_streak=streak, last_workout_date=last_day)
+    )
+
+
+def update_streak(member_id, days):
+    """Extend a member's streak with newly logged workout days.
+
+    Days on or after the last workout day are applied in O(1). A day before it
+    (a backfilled session) can join two runs, so the streak is recomputed instead.
+    Call after bump_workout_stats(), whose upsert locks the member's stats row.
+    """
+    if not days:
+        return
+
+    table = WorkoutStats.__table__
+    streak, last_day = db.session.execute(
+        select(table.c.current_streak, table.c.last_workout_date).where(table.c.member_id == member_id)
+    ).one()
+
+    for day in sorted(days):
+        if last_day is None or day > last_day + timedelta(days=1):
+            streak, last_day = 1, day
+        elif day == last_day + timedelta(days=1):
+            streak, last_day = streak + 1, day
+        elif day < last_day:
+            streak, last_day = recompute_streak(member_id)
+            break
+
+    _write_streak(member_id, streak, last_day)
+
+
+def rebuild_workout_stats():
+    """Recompute totals and streaks for every member from the workouts table.
+
+    Returns the number of members with stats.
+    """
+    table = WorkoutStats.__table__
+    day = day_bucket(Workout.workout_date)
+
+    try:
+        db.session.execute(table.delete())
+        db.session.execute(table.insert().from_select(
+            ['member_id', 'total_workouts', 'total_minutes', 'current_streak'],
+            select(Workout.member_id, func.count(Workout.workout_id),
+                   func.coalesce(func.sum(Workout.duration_minutes), 0), literal(0))
+            .group_by(Workout.member_id)
+        ))
+
+        member_days = db.session.execute(
+            select(Workout.member_id, day).group_by(Workout.member_id, day)
+            .order_by(Workout.member_id, day.desc())
+        )
+        streaks = []
+        for member_id, rows in groupby(member_days, key=lambda row: row[0]):
+            streak, last_day = streak_from_days(row[1] for row in rows)
+            streaks.append({'m': member_id, 'streak': streak, 'last_day': last_day})
+
+        if streaks:
+            db.session.execute(
+                table.update().where(table.c.member_id == bindparam('m'))
+                .values(current_streak=bindparam('streak'), last_workout_date=bindparam('last_day')),
+                streaks
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return len(streaks)
+
+
+def log_workouts(member_id):
+    """Shared handler for the user and admin endpoints. All rows must validate or none are stored."""
+    try:
+        raw_rows = read_workout_payload()
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    max_rows = current_app.config.get('WORKOUT_BATCH_MAX', 500)
+    if not raw_rows:
+        return jsonify({"success": False, "error": "No workouts to log."}), 400
+    if len(raw_rows) > max_rows:
+        return jsonify({"success": False, "error": f"Too many workouts ({len(raw_rows)}), the limit is {max_rows}."}), 400
+
+    now = _manila_now()
+    rows, report = [], []
+    for index, raw in enumerate(raw_rows):
+        values, errors = validate_workout(raw, now)
+        if errors:
+            report.append({"index": index, "errors": errors})
+        else:
+            rows.append(values)
+
+    if report:
+        return jsonify({
+            "success": False,
+            "error": f"{len(report)} of {len(raw_rows)} workouts are invalid. Nothing was logged.",
+            "workouts": report
+        }), 400
+
+    try:
+        inserted = insert_workouts(member_id, rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": f"Error logging workouts: {str(e)}"}), 500
+
+    invalidate_user_data(member_id)
+
+    return jsonify({
+        "success": True,
+        "message": f"Logged {len(inserted)} workout(s).",
+        "workouts": [
+            {"index": index, "workout_id": inserted.get(index), "duplicate": index not in inserted}
+            for index in range(len(rows))
+        ]
+    }), 201 if inserted else 200
+
+
+# ========================================
+# ENDPOINTS
+# ========================================
+@workouts.route('/user/workouts', methods=['POST'])
+def user_log_workouts():
+    """Log workouts for the logged-in member."""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Please log in to log workouts."}), 401
+    return log_workouts(session['user_id'])
+
+
+@workouts.route('/admin/member/<int:member_id>/workouts', methods=['POST'])
+@admin_required
+def admin_log_workouts(member_id):
+    """Log workouts on a member's behalf (front desk / kiosk)."""
+    if db.session.get(Member, member_id) is None:
+        return jsonify({"success": False, "error": "Member not found."}), 404
+    return log_workouts(member_id)
+
+
+def _delete_member_workout(member_id, workout_id):
+    workout = db.session.get(Workout, workout_id)
+    if workout is None or workout.member_id != member_id:
+        return jsonify({"success": False, "error": "Workout not found."}), 404
+
+    try:
+        delete_workout(workout)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": f"Error deleting workout: {str(e)}"}), 500
+
+    invalidate_user_data(member_id)
+
+    return jsonify({"success": True, "message": "Workout deleted."}), 200
+
+
+@workouts.route('/user/workouts/<int:workout_id>', methods=['DELETE'])
+def user_delete_workout(workout_id):
+    """Delete one of the logged-in member's workouts."""
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Please log in to manage workouts."}), 401
+    return _delete_member_workout(session['user_id'], workout_id)
+
+
+@workouts.route('/admin/member/<int:member_id>/workouts/<int:workout_id>', methods=['DELETE'])
+@admin_required
+def admin_delete_workout(member_id, workout_id):
+    """Delete a workout logged for a member."""
+    return _delete_member_workout(member_id, workout_id)
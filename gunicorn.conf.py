@@ -0,0 +1,33 @@
+# Gunicorn settings for `gunicorn -c gunicorn.conf.py wsgi:app`.
+# Every value can be overridden with the environment variables below.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# One process per core (plus one) so requests use every core; threads cover I/O waits
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+# Load the app once in the master and fork it: faster boot, shared memory pages
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Database connections opened while the master loaded the app must not be shared with workers
+    from Project import db
+    from wsgi import app
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,49 @@
+"""workout logging
+
+Revision ID: 3b8a06d5e2f1
+Revises: e19b6c3f7d08
+Create Date: 2026-10-18 15:20:47.903164
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8a06d5e2f1'
+down_revision = 'e19b6c3f7d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Databases built by db.create_all() (older create_app, seed-defaults) may already have the column/table
+    if 'idempotency_key' not in [c['name'] for c in inspector.get_columns('workouts')]:
+        op.add_column('workouts', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+    op.create_index('uq_workouts_member_idempotency_key', 'workouts', ['member_id', 'idempotency_key'],
+                    unique=True, if_not_exists=True)
+
+    if 'workout_stats' not in inspector.get_table_names():
+        op.create_table('workout_stats',
+            sa.Column('member_id', sa.Integer(), nullable=False),
+            sa.Column('total_workouts', sa.Integer(), nullable=False),
+            sa.Column('total_minutes', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['member_id'], ['members.member_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('member_id')
+        )
+
+    # Backfill totals for workouts logged before this revision
+    if not op.get_bind().execute(sa.text("SELECT 1 FROM workout_stats LIMIT 1")).first():
+        op.execute(
+            "INSERT INTO workout_stats (member_id, total_workouts, total_minutes) "
+            "SELECT member_id, COUNT(*), COALESCE(SUM(duration_minutes), 0) FROM workouts GROUP BY member_id"
+        )
+
+
+def downgrade():
+    op.drop_table('workout_stats')
+    op.drop_index('uq_workouts_member_idempotency_key', table_name='workouts')
+    with op.batch_alter_table('workouts') as batch_op:
+        batch_op.drop_column('idempotency_key')
@@ -0,0 +1,111 @@
+"""baseline schema
+
+Revision ID: 4cfdb821fa12
+Revises: 
+Create Date: 2026-10-18 06:47:36.969705
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4cfdb821fa12'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before migrations existed already have these tables
+    # (made by db.create_all()), so only create what is missing.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'admins' not in existing:
+        op.create_table('admins',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=50), nullable=False),
+            sa.Column('password_hash', sa.String(length=200), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('username')
+        )
+    if 'gym_pricing' not in existing:
+        op.create_table('gym_pricing',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('member_type', sa.Enum('Student', 'Faculty', 'Outsider', name='pricing_member_type'), nullable=False),
+            sa.Column('plan_type', sa.Enum('Daily', 'Monthly', 'Annual', name='pricing_plan_type'), nullable=False),
+            sa.Column('price', sa.Float(), nullable=False),
+            sa.Column('effective_date', sa.Date(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'members' not in existing:
+        op.create_table('members',
+            sa.Column('member_id', sa.Integer(), nullable=False),
+            sa.Column('unique_code', sa.String(length=10), nullable=False),
+            sa.Column('first_name', sa.String(length=100), nullable=False),
+            sa.Column('last_name', sa.String(length=100), nullable=False),
+            sa.Column('age', sa.Integer(), nullable=True),
+            sa.Column('gender', sa.Enum('Male', 'Female', name='member_gender'), nullable=True),
+            sa.Column('member_type', sa.Enum('Faculty', 'Outsider', 'Student', name='member_type'), nullable=False),
+            sa.Column('student_number', sa.String(length=20), nullable=True),
+            sa.Column('gym_plan', sa.Enum('Daily', 'Monthly', 'Annual', name='member_gym_plan'), nullable=False),
+            sa.Column('email', sa.String(length=150), nullable=True),
+            sa.Column('contact_number', sa.String(length=20), nullable=True),
+            sa.Column('address', sa.String(length=255), nullable=True),
+            sa.Column('start_date', sa.Date(), nullable=False),
+            sa.Column('end_date', sa.Date(), nullable=False),
+            sa.Column('status', sa.Enum('Active', 'Inactive', 'Expired', name='member_status'), nullable=True),
+            sa.Column('date_registered', sa.DateTime(), nullable=True),
+            sa.Column('price_paid', sa.Float(), nullable=True),
+            sa.Column('password_hash', sa.String(length=200), nullable=True),
+            sa.Column('is_self_registered', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('member_id'),
+            sa.UniqueConstraint('unique_code')
+        )
+    if 'price_history' not in existing:
+        op.create_table('price_history',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('member_type', sa.String(length=50), nullable=True),
+            sa.Column('plan_type', sa.String(length=50), nullable=True),
+            sa.Column('old_price', sa.Float(), nullable=True),
+            sa.Column('new_price', sa.Float(), nullable=True),
+            sa.Column('change_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'membership_logs' not in existing:
+        op.create_table('membership_logs',
+            sa.Column('log_id', sa.Integer(), nullable=False),
+            sa.Column('member_id', sa.Integer(), nullable=False),
+            sa.Column('action_type', sa.String(length=50), nullable=False),
+            sa.Column('action_date', sa.DateTime(), nullable=True),
+            sa.Column('remarks', sa.String(length=255), nullable=True),
+            sa.ForeignKeyConstraint(['member_id'], ['members.member_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('log_id')
+        )
+    if 'workouts' not in existing:
+        op.create_table('workouts',
+            sa.Column('workout_id', sa.Integer(), nullable=False),
+            sa.Column('member_id', sa.Integer(), nullable=False),
+            sa.Column('workout_date', sa.DateTime(), nullable=False),
+            sa.Column('exercise_type', sa.String(length=50), nullable=False),
+            sa.Column('duration_minutes', sa.Integer(), nullable=False),
+            sa.Column('calories_burned', sa.Integer(), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['member_id'], ['members.member_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('workout_id')
+        )
+
+
+def downgrade():
+    op.drop_table('workouts')
+    op.drop_table('membership_logs')
+    op.drop_table('price_history')
+    op.drop_table('members')
+    op.drop_table('gym_pricing')
+    op.drop_table('admins')
+
+    # Postgres keeps named enum types after their tables are gone
+    for name in ('member_status', 'member_gym_plan', 'member_type', 'member_gender',
+                 'pricing_plan_type', 'pricing_member_type'):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,53 @@
+"""workout streaks
+
+Revision ID: 8f4c2a7b9d15
+Revises: 3b8a06d5e2f1
+Create Date: 2026-10-18 16:02:31.245880
+
+"""
+from datetime import timedelta
+from itertools import groupby
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f4c2a7b9d15'
+down_revision = '3b8a06d5e2f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Databases built by db.create_all() (older create_app, seed-defaults) already have the columns
+    columns = [c['name'] for c in sa.inspect(bind).get_columns('workout_stats')]
+    if 'current_streak' not in columns:
+        op.add_column('workout_stats', sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'))
+    if 'last_workout_date' not in columns:
+        op.add_column('workout_stats', sa.Column('last_workout_date', sa.Date(), nullable=True))
+
+    # Backfill streaks (same walk as `flask repair-workout-stats`)
+    day = "date(workout_date)" if bind.dialect.name == 'sqlite' else "CAST(workout_date AS DATE)"
+    rows = bind.execute(sa.text(
+        f"SELECT member_id, {day} AS day FROM workouts"
+        f" GROUP BY member_id, {day} ORDER BY member_id, {day} DESC"
+    ).columns(sa.column('member_id', sa.Integer), sa.column('day', sa.Date)))
+
+    stats = sa.table('workout_stats', sa.column('member_id'), sa.column('current_streak'), sa.column('last_workout_date'))
+    for member_id, member_rows in groupby(rows, key=lambda row: row[0]):
+        days = [row[1] for row in member_rows]
+        streak = 1
+        while streak < len(days) and days[streak] == days[0] - timedelta(days=streak):
+            streak += 1
+        bind.execute(
+            stats.update().where(stats.c.member_id == member_id)
+            .values(current_streak=streak, last_workout_date=days[0])
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('workout_stats') as batch_op:
+        batch_op.drop_column('last_workout_date')
+        batch_op.drop_column('current_streak')
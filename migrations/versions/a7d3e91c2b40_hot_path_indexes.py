@@ -0,0 +1,33 @@
+"""hot path indexes
+
+Revision ID: a7d3e91c2b40
+Revises: 4cfdb821fa12
+Create Date: 2026-10-18 07:02:11.418532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e91c2b40'
+down_revision = '4cfdb821fa12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # if_not_exists: databases built by db.create_all() (older create_app) may have them already
+    op.create_index('ix_members_status_end_date', 'members', ['status', 'end_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_members_type_registered', 'members', ['member_type', 'date_registered'], unique=False, if_not_exists=True)
+    op.create_index('ix_members_email', 'members', ['email'], unique=False, if_not_exists=True)
+    op.create_index('ix_membership_logs_action_date', 'membership_logs', ['action_date', 'log_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_workouts_member_date', 'workouts', ['member_id', 'workout_date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_workouts_member_date', table_name='workouts')
+    op.drop_index('ix_membership_logs_action_date', table_name='membership_logs')
+    op.drop_index('ix_members_email', table_name='members')
+    op.drop_index('ix_members_type_registered', table_name='members')
+    op.drop_index('ix_members_status_end_date', table_name='members')
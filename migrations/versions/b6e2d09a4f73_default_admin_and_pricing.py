@@ -0,0 +1,49 @@
+"""default admin and pricing
+
+Revision ID: b6e2d09a4f73
+Revises: 8f4c2a7b9d15
+Create Date: 2026-10-18 19:12:05.604118
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+import pytz
+from werkzeug.security import generate_password_hash
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d09a4f73'
+down_revision = '8f4c2a7b9d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Seeding used to happen in create_app() on every boot; existing databases already have these rows
+    bind = op.get_bind()
+
+    admins = sa.table('admins', sa.column('username'), sa.column('password_hash'))
+    if bind.execute(sa.select(admins.c.username).where(admins.c.username == 'admin')).first() is None:
+        op.bulk_insert(admins, [{'username': 'admin', 'password_hash': generate_password_hash('admin123')}])
+
+    pricing = sa.table('gym_pricing', sa.column('member_type'), sa.column('plan_type'),
+                       sa.column('price'), sa.column('effective_date'))
+    if bind.execute(sa.select(sa.func.count()).select_from(pricing)).scalar() == 0:
+        today = datetime.now(pytz.timezone('Asia/Manila')).date()
+        op.bulk_insert(pricing, [
+            {'member_type': member_type, 'plan_type': plan_type, 'price': price, 'effective_date': today}
+            for member_type, plan_type, price in [
+                ('Student', 'Daily', 40),
+                ('Faculty', 'Daily', 40),
+                ('Outsider', 'Daily', 60),
+                ('Student', 'Monthly', 500),
+                ('Faculty', 'Monthly', 500),
+                ('Outsider', 'Monthly', 800),
+            ]
+        ])
+
+
+def downgrade():
+    # The admin and prices may have been edited since; leave the data in place
+    pass
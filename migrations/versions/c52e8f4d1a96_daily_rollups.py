@@ -0,0 +1,48 @@
+"""daily rollups
+
+Revision ID: c52e8f4d1a96
+Revises: a7d3e91c2b40
+Create Date: 2026-10-18 07:41:25.093317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e8f4d1a96'
+down_revision = 'a7d3e91c2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'daily_rollups' not in sa.inspect(bind).get_table_names():
+        op.create_table('daily_rollups',
+            sa.Column('local_date', sa.Date(), nullable=False),
+            sa.Column('member_type', sa.String(length=20), nullable=False),
+            sa.Column('gym_plan', sa.String(length=20), nullable=False),
+            sa.Column('registrations', sa.Integer(), nullable=False),
+            sa.Column('revenue', sa.Float(), nullable=False),
+            sa.Column('activations', sa.Integer(), nullable=False),
+            sa.Column('expirations', sa.Integer(), nullable=False),
+            sa.Column('deactivations', sa.Integer(), nullable=False),
+            sa.Column('deletions', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('local_date', 'member_type', 'gym_plan')
+        )
+
+    # Backfill registrations and revenue from existing members (same as `flask rebuild-rollups`)
+    if bind.execute(sa.text("SELECT 1 FROM daily_rollups LIMIT 1")).first() is None:
+        day = "date(date_registered)" if bind.dialect.name == 'sqlite' else "CAST(date_registered AS DATE)"
+        op.execute(
+            "INSERT INTO daily_rollups (local_date, member_type, gym_plan, registrations, revenue,"
+            " activations, expirations, deactivations, deletions)"
+            f" SELECT {day}, member_type, gym_plan, COUNT(*), COALESCE(SUM(price_paid), 0), 0, 0, 0, 0"
+            " FROM members WHERE date_registered IS NOT NULL"
+            f" GROUP BY {day}, member_type, gym_plan"
+        )
+
+
+def downgrade():
+    op.drop_table('daily_rollups')
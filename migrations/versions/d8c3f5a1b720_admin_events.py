@@ -0,0 +1,35 @@
+"""admin events
+
+Revision ID: d8c3f5a1b720
+Revises: b6e2d09a4f73
+Create Date: 2026-10-18 20:41:19.337052
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8c3f5a1b720'
+down_revision = 'b6e2d09a4f73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases built by db.create_all() (seed-defaults) may already have the table
+    if 'admin_events' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('admin_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('event_type', sa.String(length=32), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sqlite_autoincrement=True
+        )
+    op.create_index('ix_admin_events_created_at', 'admin_events', ['created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_admin_events_created_at', table_name='admin_events')
+    op.drop_table('admin_events')
@@ -0,0 +1,30 @@
+"""code sequences
+
+Revision ID: e19b6c3f7d08
+Revises: c52e8f4d1a96
+Create Date: 2026-10-18 08:05:52.640118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e19b6c3f7d08'
+down_revision = 'c52e8f4d1a96'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Counters are seeded lazily from the highest existing code on first use
+    if 'code_sequences' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('code_sequences',
+            sa.Column('prefix', sa.String(length=10), nullable=False),
+            sa.Column('last_value', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('prefix')
+        )
+
+
+def downgrade():
+    op.drop_table('code_sequences')
@@ -0,0 +1,39 @@
+"""data versions
+
+Revision ID: f2a7c4e90b31
+Revises: d8c3f5a1b720
+Create Date: 2026-10-18 22:06:47.518230
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+import pytz
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a7c4e90b31'
+down_revision = 'd8c3f5a1b720'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Databases built by db.create_all() (seed-defaults) may already have the table
+    if 'data_versions' not in sa.inspect(bind).get_table_names():
+        op.create_table('data_versions',
+            sa.Column('name', sa.String(length=32), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+    versions = sa.table('data_versions', sa.column('name'), sa.column('version'), sa.column('updated_at'))
+    if bind.execute(sa.select(versions.c.name).where(versions.c.name == 'admin')).first() is None:
+        now = datetime.now(pytz.timezone('Asia/Manila')).replace(tzinfo=None)
+        op.bulk_insert(versions, [{'name': 'admin', 'version': 1, 'updated_at': now}])
+
+
+def downgrade():
+    op.drop_table('data_versions')
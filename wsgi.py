@@ -0,0 +1,5 @@
+"""Production entry point for pre-fork servers, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`."""
+import os
+from Project import create_app
+
+app = create_app(os.environ.get('GTS_CONFIG', 'production'))